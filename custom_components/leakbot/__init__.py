@@ -13,11 +13,29 @@ from homeassistant.const import (
     CONF_SCAN_INTERVAL,
     Platform,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.core import HomeAssistant, ServiceCall
 from .api import LeakbotApiClient
-from .const import DOMAIN, DEFAULT_REFRESH
-from .coordinator import LeakbotDataUpdateCoordinator
+from .const import (
+    DOMAIN,
+    DEFAULT_REFRESH,
+    CONF_ADAPTIVE_POLLING,
+    CONF_HISTORY_INTERVAL,
+    CONF_MAX_REQUESTS,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    DEFAULT_ADAPTIVE_POLLING,
+    DEFAULT_HISTORY_INTERVAL,
+    DEFAULT_MAX_REQUESTS,
+    DEFAULT_RATE_BURST,
+    DEFAULT_RATE_LIMIT,
+    SERVICE_REFRESH_ACCOUNT,
+)
+from .coordinator import LeakbotDataUpdateCoordinator, calendar_store
+from .session import (
+    async_close_leakbot_sessions,
+    async_get_leakbot_limiter,
+    async_get_leakbot_session,
+)
 
 PLATFORMS: list[Platform] = [
     Platform.SENSOR,
@@ -29,31 +47,71 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration using UI."""
     hass.data.setdefault(DOMAIN, {})
 
+    limiter = async_get_leakbot_limiter(hass)
+    limiter.set_limit(
+        entry.entry_id,
+        entry.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+        entry.options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+    )
+
     hass.data[DOMAIN][entry.entry_id] = coordinator = LeakbotDataUpdateCoordinator(
         hass=hass,
         client=LeakbotApiClient(
             username=entry.data[CONF_USERNAME],
             password=entry.data[CONF_PASSWORD],
-            session=async_get_clientsession(hass),
+            session=async_get_leakbot_session(hass),
+            limiter=limiter,
         ),
         entry=entry,
         scan_interval=entry.options.get(CONF_SCAN_INTERVAL, DEFAULT_REFRESH),
+        history_interval=entry.options.get(
+            CONF_HISTORY_INTERVAL, DEFAULT_HISTORY_INTERVAL
+        ),
+        max_requests=entry.options.get(CONF_MAX_REQUESTS, DEFAULT_MAX_REQUESTS),
+        adaptive_polling=entry.options.get(
+            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+        ),
     )
+    await coordinator.async_load_calendars()
     await coordinator.async_config_entry_first_refresh()
 
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
     entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
+    if not hass.services.has_service(DOMAIN, SERVICE_REFRESH_ACCOUNT):
+        hass.services.async_register(
+            DOMAIN, SERVICE_REFRESH_ACCOUNT, async_refresh_account
+        )
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
     if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator: LeakbotDataUpdateCoordinator = hass.data[DOMAIN].pop(
+            entry.entry_id
+        )
+        await coordinator.async_save_calendars()
+        async_get_leakbot_limiter(hass).remove_limit(entry.entry_id)
+        if not hass.data[DOMAIN]:
+            hass.services.async_remove(DOMAIN, SERVICE_REFRESH_ACCOUNT)
+            await async_close_leakbot_sessions(hass)
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored data when the entry is deleted."""
+    await calendar_store(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def async_refresh_account(call: ServiceCall) -> None:
+    """Refresh the account, address and tenant details of each entry."""
+    coordinator: LeakbotDataUpdateCoordinator
+    for coordinator in call.hass.data[DOMAIN].values():
+        await coordinator.async_refresh_account()
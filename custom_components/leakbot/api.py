@@ -2,14 +2,27 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
+import random
+import re
+import time
 
-from aiohttp import ClientSession, ClientError, ClientResponse
+from aiohttp import ClientSession, ClientError, ClientResponse, ClientTimeout
 from json.decoder import JSONDecodeError
-from typing import Any
-from urllib.parse import urljoin
+from logging import DEBUG
+from collections.abc import AsyncIterator
+from enum import Enum
+from typing import Any, Final, NamedTuple
+from urllib.parse import urljoin, urlparse
 
-from .const import LOGGER
+from .const import DEFAULT_RATE_BURST, DEFAULT_RATE_LIMIT, LOGGER
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional, fall back to the standard library.
+    json_loads = json.loads
 
 API_URL = "https://app.leakbot.io"
 API_LOGIN = "/v1.0/User/Account/MyLogin/"
@@ -22,6 +35,34 @@ API_DEVICE_MYMSG = "/v1.0/Device/Device/MyListMessagesForDevice"
 API_DEVICE_WATERUSAGE = "/v1.0/Device/Device/WaterUsage"
 API_DEVICE_MYSIMPLEMSG = "/v1.0/Device/Device/MySimpleDerivedEventList"
 
+# Headers sent with every request, the API only speaks JSON.
+API_HEADERS = {
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+}
+
+# Responses that are fingerprinted so unchanged payloads can be skipped.
+API_FINGERPRINTED = (API_DEVICE_MYVIEW, API_DEVICE_MYMSG, API_DEVICE_WATERUSAGE)
+
+# Request timeouts in seconds, the event list can be large on first sync.
+API_TIMEOUT = 30
+API_TIMEOUTS = {
+    API_DEVICE_MYSIMPLEMSG: 120,
+}
+
+# Retries of failed reads, with exponential backoff and full jitter.
+API_RETRIES = 2
+API_BACKOFF_BASE = 1.0
+API_BACKOFF_MAX = 30.0
+
+# Events parsed from a streamed event list before they are handed on.
+EVENT_STREAM_BATCH = 500
+EVENT_STREAM_CHUNK = 65536
+
+# Failures in a row that open the circuit, and seconds before trying again.
+BREAKER_THRESHOLD = 5
+BREAKER_RESET = 60.0
+
 
 class LeakbotApiClientError(Exception):
     """Exception to indicate a general API error."""
@@ -45,42 +86,405 @@ class LeakbotApiClientTokenError(LeakbotApiClientError):
     """Exception to indicate token is invalid."""
 
 
+class LeakbotApiClientCircuitOpenError(LeakbotApiClientCommunicationError):
+    """Exception to indicate requests are blocked after repeated failures."""
+
+
+def _retryable(status: int | None) -> bool:
+    """Return true for failures worth retrying, timeouts and server errors."""
+    return status is None or status == 429 or status >= 500
+
+
+class LeakbotCircuitBreaker:
+    """Fail requests fast after repeated failures, until a reset period passes."""
+
+    def __init__(
+        self, threshold: int = BREAKER_THRESHOLD, reset: float = BREAKER_RESET
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self._threshold = threshold
+        self._reset = reset
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+        self.times_opened = 0
+
+    @property
+    def state(self) -> str:
+        """Return closed, open or half_open."""
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self._reset:
+            return "open"
+        return "half_open"
+
+    def check(self) -> None:
+        """Raise if the circuit is open, half open lets a single probe through.
+
+        Every request that passes must call release when it finishes.
+        """
+        state = self.state
+        if state == "open" or (state == "half_open" and self._probing):
+            raise LeakbotApiClientCircuitOpenError(
+                None, "Too many failed requests, waiting before trying again"
+            )
+        if state == "half_open":
+            self._probing = True
+
+    def release(self) -> None:
+        """Let another probe through once a request has finished."""
+        self._probing = False
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit at the threshold."""
+        self._failures += 1
+        if self._opened_at is not None or self._failures >= self._threshold:
+            if self.state != "open":
+                self.times_opened += 1
+            self._opened_at = time.monotonic()
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the breaker state for diagnostics."""
+        return {
+            "state": self.state,
+            "failures": self._failures,
+            "times_opened": self.times_opened,
+        }
+
+
+class LeakbotRateLimiter:
+    """Token bucket limiting the rate of requests to the API."""
+
+    def __init__(
+        self, rate: float = DEFAULT_RATE_LIMIT, burst: int = DEFAULT_RATE_BURST
+    ) -> None:
+        """Initialize the rate limiter with a full bucket."""
+        self._default_limit = (rate, burst)
+        self._limits: dict[str, tuple[float, int]] = {}
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.total_wait = 0.0
+
+    async def acquire(self) -> float:
+        """Wait for a token, returning the seconds spent waiting."""
+        started = time.monotonic()
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self._burst, self._tokens + (now - self._updated) * self._rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    break
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+        waited = time.monotonic() - started
+        self.total_wait += waited
+        return waited
+
+    def set_limit(self, key: str, rate: float, burst: int) -> None:
+        """Set the rate and burst asked for by a config entry.
+
+        The limiter is shared, so the strictest limit of all entries applies.
+        """
+        self._limits[key] = (rate, burst)
+        self._apply_limits()
+
+    def remove_limit(self, key: str) -> None:
+        """Remove the limit set by a config entry."""
+        if self._limits.pop(key, None) is not None:
+            self._apply_limits()
+
+    def _apply_limits(self) -> None:
+        """Apply the strictest of the limits set, or the default."""
+        limits = list(self._limits.values()) or [self._default_limit]
+        self._rate = min(rate for rate, _ in limits)
+        self._burst = min(burst for _, burst in limits)
+        self._tokens = min(self._tokens, self._burst)
+
+
+# Bytes that change the JSON structure: quotes, escapes, objects and arrays.
+_JSON_STRUCTURE = re.compile(rb'["\\{}\[\]]')
+
+
+class LeakbotEventListParser:
+    """Split the events array of an event list response as it arrives.
+
+    Only the structure is scanned, each event object is returned as raw
+    bytes so it can be decoded on its own. Bytes before the array are kept
+    so an error response can be decoded at the end.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the parser."""
+        self._buffer = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._string_start = 0
+        self._last_string = b""
+        self._array_depth: int | None = None
+        self._object_start: int | None = None
+        self.found = False
+        self.head = bytearray()
+
+    def feed(self, chunk: bytes) -> list[bytes]:
+        """Add a chunk of the response, returning the events completed by it."""
+        if not self.found:
+            self.head += chunk
+
+        buffer = self._buffer
+        buffer += chunk
+        events: list[bytes] = []
+        pos = self._pos
+        while (match := _JSON_STRUCTURE.search(buffer, pos)) is not None:
+            index = match.start()
+            char = buffer[index]
+            pos = index + 1
+            if self._in_string:
+                if char == 0x5C:  # Backslash, skip the escaped byte.
+                    if index + 1 >= len(buffer):
+                        pos = index
+                        break
+                    pos = index + 2
+                elif char == 0x22:
+                    self._in_string = False
+                    if self._depth == 1:
+                        self._last_string = bytes(buffer[self._string_start : index])
+            elif char == 0x22:
+                self._in_string = True
+                self._string_start = index + 1
+            elif char in (0x7B, 0x5B):  # Open object or array.
+                self._depth += 1
+                if (
+                    char == 0x5B
+                    and self._depth == 2
+                    and not self.found
+                    and self._last_string == b"events"
+                ):
+                    self._array_depth = self._depth
+                    self.found = True
+                elif (
+                    self._array_depth is not None
+                    and self._depth == self._array_depth + 1
+                ):
+                    self._object_start = index
+            else:  # Close object or array.
+                if self._array_depth is not None:
+                    if self._depth == self._array_depth + 1 and char == 0x7D:
+                        events.append(bytes(buffer[self._object_start : index + 1]))
+                        self._object_start = None
+                    elif self._depth == self._array_depth:
+                        self._array_depth = None
+                self._depth -= 1
+
+        # Drop the bytes that have been scanned and are no longer needed.
+        keep = pos
+        if self._object_start is not None:
+            keep = min(keep, self._object_start)
+        if self._in_string:
+            keep = min(keep, self._string_start)
+        del buffer[:keep]
+        self._pos = pos - keep
+        self._string_start -= keep
+        if self._object_start is not None:
+            self._object_start -= keep
+        return events
+
+
+class UnchangedType(Enum):
+    """Singleton type for a response that has not changed."""
+
+    _singleton = 0
+
+
+UNCHANGED: Final = UnchangedType._singleton
+
+
+class LeakbotResponseFingerprint(NamedTuple):
+    """Fingerprint of the last response for an endpoint and its parameters."""
+
+    digest: bytes
+    etag: str | None
+    last_modified: str | None
+
+
 class LeakbotApiClient:
-    """Leakbot API Client Connector."""
+    """Leakbot API Client Connector.
+
+    Fingerprinted endpoints return UNCHANGED instead of the response when it
+    is the same as the previous call, callers keep what they parsed from it.
+    Only the digest and validators are kept, not the responses.
+    """
 
     def __init__(
         self,
         username: str,
         password: str,
         session: ClientSession,
+        limiter: LeakbotRateLimiter | None = None,
     ) -> None:
-        """Initialize API Client."""
+        """Initialize API Client.
+
+        The limiter is shared between clients to limit the overall request rate.
+        """
         self._session = session
+        self._limiter = limiter
+        self.rate_limit_wait = 0.0
         self._username = username
         self._password = password
         self._connected = False
         self._token = "randomtoken"
+        self._login_lock = asyncio.Lock()
+        self._breaker = LeakbotCircuitBreaker()
+        self.retries = 0
+        self._fingerprints: dict[tuple[str, ...], LeakbotResponseFingerprint] = {}
+        self.fingerprint_stats: dict[str, dict[str, int]] = {}
+
+    @property
+    def diagnostics(self) -> dict[str, Any]:
+        """Return the retry count and circuit breaker state."""
+        return {
+            "retries": self.retries,
+            "rate_limit_wait": self.rate_limit_wait,
+            "circuit_breaker": self._breaker.as_dict(),
+            "unchanged_responses": {
+                endpoint: {
+                    **stats,
+                    "hit_rate": stats["unchanged"] / stats["requests"],
+                }
+                for endpoint, stats in self.fingerprint_stats.items()
+                if stats["requests"]
+            },
+        }
 
-    async def _post(self, url: str, params: dict[str, Any]) -> dict[str, Any]:
+    async def _post(
+        self, url: str, params: dict[str, Any]
+    ) -> dict[str, Any] | UnchangedType:
+        """Perform post to the api, logging in again if the token expired."""
+        token = self._token
+        try:
+            return await self._post_retry(url, params)
+        except LeakbotApiClientTokenError:
+            if "token" not in params:
+                raise
+
+        LOGGER.debug("Token expired, logging in again and retrying: %s", url)
+        await self._relogin(token)
+        return await self._post_retry(url, {**params, "token": self._token})
+
+    async def _post_retry(
+        self, url: str, params: dict[str, Any]
+    ) -> dict[str, Any] | UnchangedType:
+        """Perform post to the api, retrying reads that fail on the server side.
+
+        The circuit breaker counts one failure for a request once its retries
+        are used up, and only when the failure was worth retrying.
+        """
+        self._breaker.check()
+        try:
+            # Login is not retried so a bad password is not sent repeatedly.
+            attempts = 1 if url.endswith(API_LOGIN) else API_RETRIES + 1
+            for attempt in range(attempts):
+                try:
+                    result = await self._post_once(url, params)
+                except LeakbotApiClientCommunicationError as ex:
+                    if not _retryable(ex.status):
+                        raise
+                    if attempt == attempts - 1:
+                        self._breaker.record_failure()
+                        raise
+
+                    self.retries += 1
+                    delay = random.uniform(
+                        0, min(API_BACKOFF_MAX, API_BACKOFF_BASE * 2**attempt)
+                    )
+                    LOGGER.debug("Retrying %s in %.1fs: %s", url, delay, ex)
+                    await asyncio.sleep(delay)
+                else:
+                    self._breaker.record_success()
+                    return result
+        finally:
+            self._breaker.release()
+
+        raise LeakbotApiClientCommunicationError(None, "Error fetching information")
+
+    async def _relogin(self, expired_token: str) -> None:
+        """Login again once, concurrent callers share the same login."""
+        async with self._login_lock:
+            if self._token == expired_token:
+                await self.login()
+
+    async def _post_once(
+        self, url: str, params: dict[str, Any]
+    ) -> dict[str, Any] | UnchangedType:
         """Perform post to the api."""
         response: ClientResponse | None = None
+        body = b""
+        if self._limiter is not None:
+            self.rate_limit_wait += await self._limiter.acquire()
+
+        # Send the validators of the last response for fingerprinted endpoints.
+        path = urlparse(url).path
+        fingerprint_key: tuple[str, ...] | None = None
+        fingerprint: LeakbotResponseFingerprint | None = None
+        headers = dict(API_HEADERS)
+        if path in API_FINGERPRINTED:
+            fingerprint_key = (
+                path,
+                *(f"{key}={value}" for key, value in params.items() if key != "token"),
+            )
+            if (fingerprint := self._fingerprints.get(fingerprint_key)) is not None:
+                if fingerprint.etag:
+                    headers["If-None-Match"] = fingerprint.etag
+                if fingerprint.last_modified:
+                    headers["If-Modified-Since"] = fingerprint.last_modified
+
         try:
             response = await self._session.post(
                 url,
                 data=json.dumps(params),
-                headers={
-                    "Accept": "application/json",
-                    "Content-Type": "application/json",
-                },
+                headers=headers,
                 cookies={"lctoken": self._token},
+                timeout=ClientTimeout(total=API_TIMEOUTS.get(path, API_TIMEOUT)),
             )
-            LOGGER.debug(
-                "__post: response status: %s, content: %s",
-                response.status,
-                await response.text(),
-            )
+            body = await response.read()
+            if LOGGER.isEnabledFor(DEBUG):
+                LOGGER.debug(
+                    "__post: response status: %s, content: %s",
+                    response.status,
+                    body.decode(errors="replace"),
+                )
             response.raise_for_status()
-            response_json = await response.json()
+
+            if fingerprint_key is not None:
+                stats = self.fingerprint_stats.setdefault(
+                    path, {"requests": 0, "unchanged": 0}
+                )
+                stats["requests"] += 1
+                digest = hashlib.blake2b(body, digest_size=16).digest()
+                if fingerprint is not None and (
+                    response.status == 304 or digest == fingerprint.digest
+                ):
+                    stats["unchanged"] += 1
+                    return UNCHANGED
+
+            response_json = json_loads(body)
+        except TimeoutError as ex:
+            LOGGER.error("Timeout Error: %s", url)
+            raise LeakbotApiClientCommunicationError(
+                None, "Timeout fetching information"
+            ) from ex
         except ClientError as ex:
             LOGGER.error("Client Error: %s", ex)
             status = response.status if response is not None else None
@@ -88,7 +492,7 @@ class LeakbotApiClient:
                 status, "Error fetching information"
             ) from ex
         except JSONDecodeError as ex:
-            response_text = await response.text() if response is not None else ""
+            response_text = body.decode(errors="replace")
             status = response.status if response is not None else None
             LOGGER.error("JSON Decode Error: %s:%s", status, response_text)
             raise LeakbotApiClientCommunicationError(status, response_text) from ex
@@ -98,9 +502,27 @@ class LeakbotApiClient:
                 raise LeakbotApiClientTokenError(
                     response_json["error"], response_json["description"]
                 )
+            if path.endswith(API_LOGIN):
+                raise LeakbotApiClientAuthenticationError(
+                    response_json["error"], response_json.get("description")
+                )
+            raise LeakbotApiClientError(
+                response_json["error"], response_json.get("description")
+            )
+
+        if fingerprint_key is not None:
+            self._fingerprints[fingerprint_key] = LeakbotResponseFingerprint(
+                digest,
+                response.headers.get("ETag"),
+                response.headers.get("Last-Modified"),
+            )
 
         return response_json
 
+    def reset_fingerprints(self) -> None:
+        """Forget the fingerprints, so every response is returned in full."""
+        self._fingerprints.clear()
+
     def is_connected(self) -> bool:
         """Is the API Connected."""
         return self._connected
@@ -111,13 +533,11 @@ class LeakbotApiClient:
             "username": self._username,
             "password": self._password,
         }
-        result_json = await self._post(urljoin(API_URL, API_LOGIN), params)
-
-        if "error" in result_json:
+        try:
+            result_json = await self._post(urljoin(API_URL, API_LOGIN), params)
+        except LeakbotApiClientAuthenticationError:
             self._connected = False
-            raise LeakbotApiClientAuthenticationError(
-                result_json["error"], result_json["description"]
-            )
+            raise
 
         self._token = result_json["token"]
         self._connected = True
@@ -151,14 +571,16 @@ class LeakbotApiClient:
 
         return result_json
 
-    async def get_device_data(self, device_id: str) -> dict[str, Any]:
+    async def get_device_data(self, device_id: str) -> dict[str, Any] | UnchangedType:
         """Retrieve the Device Data."""
         params = {"token": self._token, "LbDevice_ID": device_id}
         result_json = await self._post(urljoin(API_URL, API_DEVICE_MYVIEW), params)
 
         return result_json
 
-    async def get_device_messages(self, device_id: str) -> dict[str, Any]:
+    async def get_device_messages(
+        self, device_id: str
+    ) -> dict[str, Any] | UnchangedType:
         """Retrieve the Device Messages."""
         params = {"token": self._token, "LbDevice_ID": device_id, "fetch_size": 1}
         result_json = await self._post(urljoin(API_URL, API_DEVICE_MYMSG), params)
@@ -167,7 +589,7 @@ class LeakbotApiClient:
 
     async def get_device_water_usage(
         self, device_id: str, timezoneoffest: int
-    ) -> dict[str, Any]:
+    ) -> dict[str, Any] | UnchangedType:
         """Retrieve the Device Water Usage."""
         params = {
             "token": self._token,
@@ -191,6 +613,105 @@ class LeakbotApiClient:
 
         return result_json
 
+    async def iter_device_simple_event_list(
+        self, device_id: str, starting_date: str
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Retrieve the Device Simple Event List in batches as it arrives.
+
+        The response is not retried after a failure as events may already
+        have been handed on, an expired token is renewed as no events are
+        returned with the error.
+        """
+        params = {
+            "token": self._token,
+            "LbDevice_ID": device_id,
+            "starting_date": starting_date,
+        }
+        url = urljoin(API_URL, API_DEVICE_MYSIMPLEMSG)
+        token = self._token
+        try:
+            async for events in self._stream_events(url, params):
+                yield events
+            return
+        except LeakbotApiClientTokenError:
+            pass
+
+        LOGGER.debug("Token expired, logging in again and retrying: %s", url)
+        await self._relogin(token)
+        async for events in self._stream_events(url, {**params, "token": self._token}):
+            yield events
+
+    async def _stream_events(
+        self, url: str, params: dict[str, Any]
+    ) -> AsyncIterator[list[dict[str, Any]]]:
+        """Post to the api and yield batches of the events in the response."""
+        self._breaker.check()
+        try:
+            if self._limiter is not None:
+                self.rate_limit_wait += await self._limiter.acquire()
+
+            parser = LeakbotEventListParser()
+            status: int | None = None
+            try:
+                async with self._session.post(
+                    url,
+                    data=json.dumps(params),
+                    headers=API_HEADERS,
+                    cookies={"lctoken": self._token},
+                    timeout=ClientTimeout(
+                        total=API_TIMEOUTS.get(urlparse(url).path, API_TIMEOUT)
+                    ),
+                ) as response:
+                    status = response.status
+                    response.raise_for_status()
+
+                    batch: list[dict[str, Any]] = []
+                    async for chunk in response.content.iter_chunked(
+                        EVENT_STREAM_CHUNK
+                    ):
+                        batch.extend(json_loads(event) for event in parser.feed(chunk))
+                        if len(batch) >= EVENT_STREAM_BATCH:
+                            yield batch
+                            batch = []
+                    if batch:
+                        yield batch
+            except TimeoutError as ex:
+                self._breaker.record_failure()
+                LOGGER.error("Timeout Error: %s", url)
+                raise LeakbotApiClientCommunicationError(
+                    None, "Timeout fetching information"
+                ) from ex
+            except ClientError as ex:
+                if _retryable(status):
+                    self._breaker.record_failure()
+                LOGGER.error("Client Error: %s", ex)
+                raise LeakbotApiClientCommunicationError(
+                    status, "Error fetching information"
+                ) from ex
+            except JSONDecodeError as ex:
+                LOGGER.error("JSON Decode Error: %s", status)
+                raise LeakbotApiClientCommunicationError(status, str(ex)) from ex
+            self._breaker.record_success()
+        finally:
+            self._breaker.release()
+
+        # Without an events array the response is an error.
+        if not parser.found:
+            try:
+                response_json = json_loads(parser.head)
+            except JSONDecodeError as ex:
+                raise LeakbotApiClientCommunicationError(
+                    status, parser.head.decode(errors="replace")
+                ) from ex
+            if "error" in response_json:
+                if response_json["error"] == 52:
+                    raise LeakbotApiClientTokenError(
+                        response_json["error"], response_json["description"]
+                    )
+                raise LeakbotApiClientError(
+                    response_json["error"], response_json.get("description")
+                )
+
     async def async_get_data(self) -> Any:
         """Get data from the API."""
         return {}
@@ -0,0 +1,58 @@
+"""Backfill of Leakbot water usage history missing from the statistics."""
+
+from __future__ import annotations
+
+from datetime import date, datetime, timedelta
+
+from homeassistant.util import dt
+
+from .const import LOGGER
+from .models import LeakbotWaterUsage
+
+
+def _water_usage_date(water_usage: LeakbotWaterUsage) -> date:
+    """Return the local date the water usage was read on."""
+    return dt.as_local(dt.utc_from_timestamp(water_usage.ts / 1000)).date()
+
+
+class WaterUsageBackfill:
+    """Work out the water usage days missing from the statistics.
+
+    The API only returns the latest window of days, its time zone offset
+    is not a paging parameter, so a gap is filled from the latest reading
+    as far back as it reaches. Older days cannot be fetched and are counted
+    as missing.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the backfill."""
+        self._missing: dict[str, int] = {}
+
+    def missing_days(self, device_id: str) -> int:
+        """Return the days missing before the last reading of a device."""
+        return self._missing.get(device_id, 0)
+
+    def check(
+        self, device_id: str, water_usage: LeakbotWaterUsage, since: datetime
+    ) -> int:
+        """Count the days between since and the oldest day of the water usage.
+
+        Since is the end of the last imported statistic, there is no gap
+        before the first import.
+        """
+        missing = 0
+        if water_usage.days and since > dt.utc_from_timestamp(0):
+            oldest = min(day.offset for day in water_usage.days)
+            oldest_date = _water_usage_date(water_usage) + timedelta(days=oldest)
+            missing = max(0, (oldest_date - dt.as_local(since).date()).days - 1)
+
+        if missing and missing != self._missing.get(device_id):
+            LOGGER.warning(
+                "Water usage for device %s is missing %s days before %s, "
+                "older days are not available from the API",
+                device_id,
+                missing,
+                oldest_date,
+            )
+        self._missing[device_id] = missing
+        return missing
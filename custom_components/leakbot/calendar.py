@@ -6,7 +6,9 @@ from .entity import LeakbotEntity
 from .coordinator import LeakbotDataUpdateCoordinator
 from .const import DOMAIN
 
+from bisect import bisect_left, bisect_right
 from datetime import date, datetime, timedelta, time
+from itertools import accumulate
 from typing import Any
 
 from ical.calendar import Calendar
@@ -66,6 +68,13 @@ class LeakbotEventsCalendar(LeakbotEntity, CalendarEntity):
             Platform.CALENDAR, coordinator, device["id"], entity_description.key
         )
         self.entity_description: CalendarEntityDescription = entity_description
+        self._index: EventIntervalIndex | None = None
+        self._index_version: tuple[int, int] | None = None
+
+    @property
+    def available(self) -> bool:
+        """Return true if the events have been fetched recently."""
+        return self.coordinator.is_fresh(self._device_id, "events")
 
     @property
     def event(self) -> CalendarEvent | None:
@@ -78,12 +87,54 @@ class LeakbotEventsCalendar(LeakbotEntity, CalendarEntity):
         self, hass: HomeAssistant, start_date: datetime, end_date: datetime
     ) -> list[CalendarEvent]:
         """Get Calendar Events within a date range."""
-        dev_calendar: Calendar = self.get_device_data.get("calendar", Calendar())
-        events = dev_calendar.timeline_tz(start_date.tzinfo).overlapping(
-            start_date,
-            end_date,
+        device = self.get_device_data
+        version = (id(device.get("calendar")), device.get("calendar_version", 0))
+        if self._index is None or self._index_version != version:
+            dev_calendar: Calendar = device.get("calendar", Calendar())
+            self._index = EventIntervalIndex(dev_calendar.events)
+            self._index_version = version
+
+        return self._index.overlapping(start_date, end_date)
+
+
+class EventIntervalIndex:
+    """Events sorted by start with a running maximum end, for range queries.
+
+    The running maximum end only increases, so the first event that can end
+    after the query start is found by bisecting it. Converted calendar
+    events are cached until the index is rebuilt.
+    """
+
+    def __init__(self, events: list[Event]) -> None:
+        """Build the index."""
+        intervals = sorted(
+            (
+                (_to_datetime_local(event.start), _event_end(event), event)
+                for event in events
+            ),
+            key=lambda interval: interval[0],
         )
-        return [_get_calendar_event(event) for event in events]
+        self._starts = [interval[0] for interval in intervals]
+        self._max_ends = list(accumulate((interval[1] for interval in intervals), max))
+        self._ends = [interval[1] for interval in intervals]
+        self._events = [interval[2] for interval in intervals]
+        self._converted: list[CalendarEvent | None] = [None] * len(intervals)
+
+    def overlapping(self, start: datetime, end: datetime) -> list[CalendarEvent]:
+        """Return the events overlapping the range, oldest first."""
+        first = bisect_right(self._max_ends, start)
+        last = bisect_left(self._starts, end)
+
+        result: list[CalendarEvent] = []
+        for index in range(first, last):
+            if self._ends[index] <= start:
+                continue
+            if (converted := self._converted[index]) is None:
+                converted = self._converted[index] = _get_calendar_event(
+                    self._events[index]
+                )
+            result.append(converted)
+        return result
 
 
 def _to_datetime(d: datetime | date) -> datetime:
@@ -92,6 +143,25 @@ def _to_datetime(d: datetime | date) -> datetime:
     return datetime.combine(d, time.min)
 
 
+def _to_datetime_local(d: datetime | date) -> datetime:
+    """Return a date or datetime as a local datetime."""
+    if isinstance(d, datetime):
+        return dt.as_local(d)
+    return dt.start_of_local_day(d)
+
+
+def _event_end(event: Event) -> datetime:
+    """Return the end of an event as shown, matching _get_calendar_event."""
+    start = _to_datetime_local(event.start)
+    end = _to_datetime_local(event.end)
+    if isinstance(event.start, datetime) and isinstance(event.end, datetime):
+        if end <= start:
+            return start + timedelta(minutes=30)
+    elif end < start:
+        return start + timedelta(days=1)
+    return end
+
+
 def _get_calendar_event(event: Event) -> CalendarEvent:
     """Return a CalendarEvent."""
     start: datetime | date
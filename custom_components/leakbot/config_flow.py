@@ -15,7 +15,6 @@ from homeassistant.config_entries import (
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, CONF_SCAN_INTERVAL
 from homeassistant.core import callback
 from homeassistant.helpers import selector
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 
 from .api import (
     LeakbotApiClient,
@@ -23,7 +22,32 @@ from .api import (
     LeakbotApiClientCommunicationError,
     LeakbotApiClientError,
 )
-from .const import DOMAIN, LOGGER, DEFAULT_REFRESH, MIN_REFRESH, MAX_REFRESH
+from .const import (
+    DOMAIN,
+    LOGGER,
+    DEFAULT_REFRESH,
+    MIN_REFRESH,
+    MAX_REFRESH,
+    CONF_ADAPTIVE_POLLING,
+    DEFAULT_ADAPTIVE_POLLING,
+    CONF_HISTORY_INTERVAL,
+    DEFAULT_HISTORY_INTERVAL,
+    MIN_HISTORY_INTERVAL,
+    MAX_HISTORY_INTERVAL,
+    CONF_MAX_REQUESTS,
+    DEFAULT_MAX_REQUESTS,
+    MIN_MAX_REQUESTS,
+    MAX_MAX_REQUESTS,
+    CONF_RATE_LIMIT,
+    DEFAULT_RATE_LIMIT,
+    MIN_RATE_LIMIT,
+    MAX_RATE_LIMIT,
+    CONF_RATE_BURST,
+    DEFAULT_RATE_BURST,
+    MIN_RATE_BURST,
+    MAX_RATE_BURST,
+)
+from .session import async_get_leakbot_limiter, async_get_leakbot_session
 
 
 class LeakbotFlowHandler(ConfigFlow, domain=DOMAIN):
@@ -150,7 +174,8 @@ class LeakbotFlowHandler(ConfigFlow, domain=DOMAIN):
         client = LeakbotApiClient(
             username=username,
             password=password,
-            session=async_create_clientsession(self.hass),
+            session=async_get_leakbot_session(self.hass),
+            limiter=async_get_leakbot_limiter(self.hass),
         )
 
         result = {}
@@ -200,7 +225,45 @@ class LeakbotOptionsFlowHandler(OptionsFlow):
                         default=self.options.get(CONF_SCAN_INTERVAL, DEFAULT_REFRESH),
                     ): vol.All(
                         vol.Coerce(int), vol.Range(min=MIN_REFRESH, max=MAX_REFRESH)
-                    )
+                    ),
+                    vol.Required(
+                        CONF_HISTORY_INTERVAL,
+                        default=self.options.get(
+                            CONF_HISTORY_INTERVAL, DEFAULT_HISTORY_INTERVAL
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_HISTORY_INTERVAL, max=MAX_HISTORY_INTERVAL),
+                    ),
+                    vol.Required(
+                        CONF_ADAPTIVE_POLLING,
+                        default=self.options.get(
+                            CONF_ADAPTIVE_POLLING, DEFAULT_ADAPTIVE_POLLING
+                        ),
+                    ): selector.BooleanSelector(),
+                    vol.Required(
+                        CONF_MAX_REQUESTS,
+                        default=self.options.get(
+                            CONF_MAX_REQUESTS, DEFAULT_MAX_REQUESTS
+                        ),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_MAX_REQUESTS, max=MAX_MAX_REQUESTS),
+                    ),
+                    vol.Required(
+                        CONF_RATE_LIMIT,
+                        default=self.options.get(CONF_RATE_LIMIT, DEFAULT_RATE_LIMIT),
+                    ): vol.All(
+                        vol.Coerce(float),
+                        vol.Range(min=MIN_RATE_LIMIT, max=MAX_RATE_LIMIT),
+                    ),
+                    vol.Required(
+                        CONF_RATE_BURST,
+                        default=self.options.get(CONF_RATE_BURST, DEFAULT_RATE_BURST),
+                    ): vol.All(
+                        vol.Coerce(int),
+                        vol.Range(min=MIN_RATE_BURST, max=MAX_RATE_BURST),
+                    ),
                 }
             ),
         )
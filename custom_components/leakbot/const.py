@@ -9,6 +9,55 @@ DOMAIN = "leakbot"
 VERSION = "1.1.6-b0"
 ATTRIBUTION = "Data provided by https://leakbot.io"
 
+DATA_SESSIONS = f"{DOMAIN}_sessions"
+DATA_LIMITER = f"{DOMAIN}_limiter"
+SESSION_LIMIT_PER_HOST = 8
+SESSION_KEEPALIVE_TIMEOUT = 60
+SESSION_DNS_CACHE_TTL = 300
+
+STORAGE_VERSION = 1
+STORAGE_SAVE_DELAY = 30
+
+# Open events are refetched until they close, but no further back than this.
+OPEN_EVENT_MAX_AGE = 30
+
+# Seconds added once to the refresh interval so accounts do not poll together.
+STARTUP_JITTER = 120
+
+# Data not fetched for this many of its refresh intervals is unavailable.
+STALE_INTERVALS = 3
+
 DEFAULT_REFRESH = 30
 MIN_REFRESH = 15
 MAX_REFRESH = 21600
+
+# Adaptive polling checks the latest message at the API floor during a leak,
+# and no more often than the scan interval or this when all devices are quiet.
+CONF_ADAPTIVE_POLLING = "adaptive_polling"
+DEFAULT_ADAPTIVE_POLLING = False
+ADAPTIVE_QUIET_INTERVAL = 60
+ADAPTIVE_ACTIVE_INTERVAL = MIN_REFRESH
+
+CONF_HISTORY_INTERVAL = "history_interval"
+DEFAULT_HISTORY_INTERVAL = 360
+MIN_HISTORY_INTERVAL = 60
+MAX_HISTORY_INTERVAL = 21600
+
+CONF_MAX_REQUESTS = "max_requests"
+DEFAULT_MAX_REQUESTS = 4
+MIN_MAX_REQUESTS = 1
+MAX_MAX_REQUESTS = 16
+
+# Requests per second allowed to the API across all accounts, and the burst
+# size. The limiter is shared so the strictest setting of all entries applies.
+CONF_RATE_LIMIT = "rate_limit"
+DEFAULT_RATE_LIMIT = 2.0
+MIN_RATE_LIMIT = 0.1
+MAX_RATE_LIMIT = 10.0
+
+CONF_RATE_BURST = "rate_burst"
+DEFAULT_RATE_BURST = 20
+MIN_RATE_BURST = 1
+MAX_RATE_BURST = 100
+
+SERVICE_REFRESH_ACCOUNT = "refresh_account"
@@ -3,8 +3,12 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import random
 
+from dataclasses import replace
 from datetime import timedelta, datetime, UTC
+from collections.abc import Awaitable, Callable
 from typing import Any
 
 from ical.calendar import Calendar
@@ -12,7 +16,7 @@ from ical.event import Event
 from ical.store import EventStore
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
@@ -22,19 +26,209 @@ from homeassistant.helpers.entity_registry import (
     async_get,
     async_entries_for_config_entry,
 )
+from homeassistant.helpers.storage import Store
 from homeassistant.util import dt
 
 from .api import (
+    UNCHANGED,
     LeakbotApiClient,
     LeakbotApiClientAuthenticationError,
     LeakbotApiClientCommunicationError,
-    LeakbotApiClientTokenError,
     LeakbotApiClientError,
+    UnchangedType,
 )
-from .const import DOMAIN, LOGGER
+from .backfill import WaterUsageBackfill
+from .const import (
+    ADAPTIVE_ACTIVE_INTERVAL,
+    ADAPTIVE_QUIET_INTERVAL,
+    DEFAULT_ADAPTIVE_POLLING,
+    DOMAIN,
+    LOGGER,
+    DEFAULT_HISTORY_INTERVAL,
+    DEFAULT_MAX_REQUESTS,
+    OPEN_EVENT_MAX_AGE,
+    STALE_INTERVALS,
+    STARTUP_JITTER,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .models import (
+    LeakbotDeviceInfo,
+    LeakbotEventSummary,
+    LeakbotMessage,
+    LeakbotWaterUsage,
+)
+from .timestamps import NULL_TIMESTAMP, TIMESTAMP_FORMAT, parse_local_timestamp
 
 PRODID = "-//homeassistant.io//leakbot_calendar 1.0//EN"
 
+# Endpoints read at the history interval rather than the scan interval.
+HISTORY_ENDPOINTS = ("events", "water_usage")
+
+# Leakbot started in 2016, there are no events before this.
+FIRST_EVENT_DATE = datetime(2016, 1, 1, tzinfo=UTC)
+
+
+def _event_watermark(
+    calendar_index: dict[str, Event],
+) -> tuple[datetime, dict[str, datetime]]:
+    """Work out the newest event time and open events from the calendar."""
+    watermark = FIRST_EVENT_DATE
+    open_events: dict[str, datetime] = {}
+    for event in calendar_index.values():
+        watermark = max(watermark, event.start, event.end)
+        if event.end == event.start:
+            open_events[event.uid] = event.start
+    return watermark, open_events
+
+
+def _apply_calendar_events(
+    device_calendar: Calendar,
+    calendar_index: dict[str, Event],
+    open_events: dict[str, datetime],
+    events: list[dict[str, Any]],
+) -> dict[str, Any]:
+    """Add or update Leakbot events in the calendar, run in the executor."""
+    calendar_events: EventStore = EventStore(device_calendar)
+    summary = {"added": 0, "updated": 0, "unchanged": 0, "watermark": None}
+
+    local_tz = dt.get_default_time_zone()
+    for event in events:
+        cal_start_date = parse_local_timestamp(
+            event.get("derived_event_created"), local_tz
+        )
+        cal_end_date = (
+            parse_local_timestamp(event.get("derived_event_closed"), local_tz)
+            or cal_start_date
+        )
+
+        # Track the newest time seen and events still waiting to close.
+        if summary["watermark"] is None or cal_end_date > summary["watermark"]:
+            summary["watermark"] = cal_end_date
+        if event.get("derived_event_closed") == NULL_TIMESTAMP:
+            open_events[str(event["derived_event_id"])] = cal_start_date
+        else:
+            open_events.pop(str(event["derived_event_id"]), None)
+
+        # Create Item Event to add or update.
+        item_event = Event(
+            start=cal_start_date,
+            end=cal_end_date,
+            summary=event["derived_event_code"],
+            description=event["interaction_flag"],
+            uid=event["derived_event_id"],
+        )
+
+        # If the entry exists then update, skipping unchanged events.
+        existing_event = calendar_index.get(item_event.uid)
+        if existing_event is not None:
+            if (
+                existing_event.summary == item_event.summary
+                and existing_event.description == item_event.description
+                and existing_event.end == item_event.end
+            ):
+                summary["unchanged"] += 1
+                continue
+
+            calendar_events.edit(uid=item_event.uid, item=item_event)
+            summary["updated"] += 1
+        else:
+            calendar_events.add(item_event)
+            summary["added"] += 1
+        calendar_index[item_event.uid] = item_event
+
+    return summary
+
+
+def _event_summary(
+    calendar_index: dict[str, Event],
+    open_events: dict[str, datetime],
+) -> LeakbotEventSummary:
+    """Summarise the events in a device calendar."""
+    return LeakbotEventSummary(
+        count=len(calendar_index),
+        # Later fetches append newer events, so search for the oldest.
+        first_event=min(
+            (event.start for event in calendar_index.values()), default=None
+        ),
+        leak_active=any(
+            uid in calendar_index and calendar_index[uid].summary == "LeakTrue"
+            for uid in open_events
+        ),
+    )
+
+
+def _leak_active(device: dict[str, Any]) -> bool:
+    """Return true if the device has an open leak event."""
+    event_summary: LeakbotEventSummary | None = device.get("event_summary")
+    return event_summary is not None and event_summary.leak_active
+
+
+def _guess_leak_free_days(
+    info: LeakbotDeviceInfo, event_summary: LeakbotEventSummary | None
+) -> LeakbotDeviceInfo:
+    """Guess the leak free days from the first event when not reported."""
+    if info.leak_free_days is not None:
+        return info
+    if event_summary is None or event_summary.first_event is None:
+        return info
+
+    # Commenting out as assuming if there is a leak assuming the Summary will appear.
+    # last_leak = next(
+    #    (e for e in dev_calendar.events if e.summary == "LeakTrue"),
+    #    None,
+    # )
+    # if last_leak is not None:
+    #    if (
+    #        last_leak.start_datetime.date()
+    #        == last_leak.end_datetime.date()
+    #    ):
+    #        leak_free_days = 0
+    #    else:
+    #        leak_free_days = (
+    #            today - last_leak.start_datetime.date()
+    #        ).days - 1
+    today = datetime.now().date()
+    install_days = (today - event_summary.first_event.date()).days - 1
+    return replace(info, leak_free_days=install_days)
+
+
+def calendar_store(
+    hass: HomeAssistant, entry_id: str
+) -> Store[dict[str, list[dict[str, str]]]]:
+    """Return the store holding the device calendars for an entry."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.calendar")
+
+
+def _calendar_to_store(device_calendar: Calendar) -> list[dict[str, str]]:
+    """Convert a calendar into a compact list for storage."""
+    return [
+        {
+            "uid": event.uid,
+            "start": event.start.isoformat(),
+            "end": event.end.isoformat(),
+            "summary": event.summary,
+            "description": event.description,
+        }
+        for event in device_calendar.events
+    ]
+
+
+def _calendar_from_store(stored_events: list[dict[str, str]]) -> Calendar:
+    """Rebuild a calendar from storage, run in the executor."""
+    device_calendar = Calendar()
+    device_calendar.events.extend(
+        Event(
+            start=datetime.fromisoformat(stored["start"]),
+            end=datetime.fromisoformat(stored["end"]),
+            summary=stored["summary"],
+            description=stored["description"],
+            uid=stored["uid"],
+        )
+        for stored in stored_events
+    )
+    return device_calendar
+
 
 class LeakbotDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
@@ -45,19 +239,38 @@ class LeakbotDataUpdateCoordinator(DataUpdateCoordinator):
         client: LeakbotApiClient,
         entry: ConfigEntry,
         scan_interval: int,
+        history_interval: int = DEFAULT_HISTORY_INTERVAL,
+        max_requests: int = DEFAULT_MAX_REQUESTS,
+        adaptive_polling: bool = DEFAULT_ADAPTIVE_POLLING,
     ) -> None:
         """Initialize."""
         self.client = client
         self._entry = entry
         self._connected = False
-        self._calendar_lock = asyncio.Lock()
+        self._history_interval = timedelta(minutes=history_interval)
+        self._scan_interval = timedelta(minutes=scan_interval)
+        self._adaptive_polling = adaptive_polling
+        # Added to the refresh interval until the first update succeeds, so
+        # accounts set up at the same time do not keep polling together.
+        self._startup_jitter = timedelta(seconds=random.uniform(0, STARTUP_JITTER))
+        self._refresh_account = False
+
+        # Entity state writes skipped because nothing changed.
+        self.suppressed_writes = 0
+        # Water history sensors by device, for their statistics diagnostics.
+        self.history_sensors: dict[str, Any] = {}
+        self._calendar_locks: dict[str, asyncio.Lock] = {}
+        self._request_semaphore = asyncio.Semaphore(max_requests)
+        self._calendar_store = calendar_store(hass, entry.entry_id)
+        self._stored_calendars: dict[str, Calendar] = {}
+        self.backfill = WaterUsageBackfill()
 
         super().__init__(
             hass=hass,
             logger=LOGGER,
             config_entry=entry,
             name=DOMAIN,
-            update_interval=timedelta(minutes=scan_interval),
+            update_interval=self._poll_interval() + self._startup_jitter,
         )
 
         self.old_entries: dict[str, list[str]] = {}
@@ -77,6 +290,62 @@ class LeakbotDataUpdateCoordinator(DataUpdateCoordinator):
         """Return true if connected."""
         return self._connected
 
+    async def async_load_calendars(self) -> None:
+        """Load the device calendars saved by a previous run."""
+        stored = await self._calendar_store.async_load()
+        if not stored:
+            return
+
+        for device_id, stored_events in stored.items():
+            self._stored_calendars[device_id] = await self.hass.async_add_executor_job(
+                _calendar_from_store, stored_events
+            )
+        LOGGER.debug("Loaded stored calendars for devices: %s", list(stored))
+
+    async def async_save_calendars(self) -> None:
+        """Save the device calendars now, used when unloading."""
+        await self._calendar_store.async_save(self._calendars_to_store())
+
+    def _poll_interval(self, devices: dict[str, Any] | None = None) -> timedelta:
+        """Return the time until the next refresh.
+
+        With adaptive polling the latest message is checked at the API floor
+        while any device has an open leak event, and less often when quiet.
+        """
+        if not self._adaptive_polling:
+            return self._scan_interval
+        if devices and any(_leak_active(device) for device in devices.values()):
+            return timedelta(minutes=ADAPTIVE_ACTIVE_INTERVAL)
+        return max(self._scan_interval, timedelta(minutes=ADAPTIVE_QUIET_INTERVAL))
+
+    def is_fresh(self, device_id: str, endpoint: str) -> bool:
+        """Return true if an endpoint was fetched recently enough to use."""
+        last_fetch = self.data["devices"][device_id].get("last_fetch", {})
+        if (fetched := last_fetch.get(endpoint)) is None:
+            return False
+        # History is read on the first refresh after the history interval,
+        # so it can never be fetched more often than the scan interval.
+        interval = self._scan_interval
+        if endpoint in HISTORY_ENDPOINTS:
+            interval = max(interval, self._history_interval)
+        return dt.utcnow() - fetched < interval * STALE_INTERVALS
+
+    async def async_refresh_account(self) -> None:
+        """Refresh the account, address and tenant details on the next update."""
+        self._refresh_account = True
+        await self.async_request_refresh()
+
+    @callback
+    def _calendars_to_store(self) -> dict[str, list[dict[str, str]]]:
+        """Return the device calendars to save."""
+        if self.data is None:
+            return {}
+        return {
+            device_id: _calendar_to_store(device["calendar"])
+            for device_id, device in self.data["devices"].items()
+            if "calendar" in device
+        }
+
     def remove_old_entities(self, platform: str) -> None:
         """Remove obsolete entities."""
         if platform in self.old_entries:
@@ -101,101 +370,265 @@ class LeakbotDataUpdateCoordinator(DataUpdateCoordinator):
         except LeakbotApiClientError as exception:
             raise UpdateFailed(exception) from exception
 
+    async def _request(
+        self, func: Callable[..., Awaitable[dict[str, Any]]], *args: Any
+    ) -> dict[str, Any]:
+        """Call the API, limiting the number of requests in flight."""
+        async with self._request_semaphore:
+            return await func(*args)
+
     async def _async_update_events(
         self, device_id: str, device: dict[str, Any]
-    ) -> None:
-        """Update Leakbot Events."""
-        # Get the date to start retrieving events from,
-        # this should be based on the last calendar event
-        # date or start of the compAny in 2016.
+    ) -> bool:
+        """Update Leakbot Events, returning true if the calendar changed."""
         device_calendar: Calendar = device.get("calendar", Calendar())
-        if device_calendar.events:
-            start_date = device_calendar.events[0].start
-        else:
-            start_date = datetime(2016, 1, 1, tzinfo=UTC)
 
-        calendar_events: EventStore = EventStore(device_calendar)
-
-        # Get the latest events from Leadbot.
-        start_date = start_date - timedelta(days=10)
-        starting_date = start_date.strftime("%Y-%m-%d %H:%M:%S")
-        events = await self.client.get_device_simple_event_list(
-            device_id, starting_date
-        )
+        # Index of events by uid, kept in step with the calendar.
+        calendar_index: dict[str, Event] = device.get("calendar_index", {})
+        if len(calendar_index) != len(device_calendar.events):
+            calendar_index = {event.uid: event for event in device_calendar.events}
 
-        # Check if we have Any events.
-        for event in events["events"]:
-            cal_start_date = dt.as_local(
-                datetime.strptime(
-                    event.get("derived_event_created"), "%Y-%m-%d %H:%M:%S"
-                ).replace(tzinfo=UTC)
+        # Only request events since the newest one seen, going back far
+        # enough to pick up changes to events that are still open.
+        if "event_watermark" not in device:
+            device["event_watermark"], device["open_events"] = _event_watermark(
+                calendar_index
             )
-            if event.get("derived_event_closed") == "null":
-                cal_end_date = cal_start_date
-            else:
-                cal_end_date = dt.as_local(
-                    datetime.strptime(
-                        event.get("derived_event_closed"), "%Y-%m-%d %H:%M:%S"
-                    ).replace(tzinfo=UTC)
+        open_events: dict[str, datetime] = device["open_events"]
+
+        # An event that never closes must not pin the start date, stop
+        # refetching open events once they are too old.
+        oldest_open = device["event_watermark"] - timedelta(days=OPEN_EVENT_MAX_AGE)
+        for uid, opened in list(open_events.items()):
+            if opened < oldest_open:
+                LOGGER.debug(
+                    "Device %s event %s open since %s, no longer refetched",
+                    device_id,
+                    uid,
+                    opened,
                 )
-
-            # Create Item Event to add or update.
-            item_event = Event(
-                start=cal_start_date,
-                end=cal_end_date,
-                summary=event["derived_event_code"],
-                description=event["interaction_flag"],
-                uid=event["derived_event_id"],
+                del open_events[uid]
+
+        start_date = min([device["event_watermark"], *open_events.values()])
+        starting_date = dt.as_utc(start_date).strftime(TIMESTAMP_FORMAT)
+
+        # Events are streamed, each batch is parsed, diffed and applied in a
+        # single executor job as it arrives.
+        summary: dict[str, Any] = {
+            "added": 0,
+            "updated": 0,
+            "unchanged": 0,
+            "watermark": None,
+        }
+        # The stream is closed straight away if applying a batch fails, so the
+        # response is released and the request slot freed.
+        async with (
+            self._request_semaphore,
+            contextlib.aclosing(
+                self.client.iter_device_simple_event_list(device_id, starting_date)
+            ) as event_batches,
+        ):
+            async for events in event_batches:
+                batch_summary = await self.hass.async_add_executor_job(
+                    _apply_calendar_events,
+                    device_calendar,
+                    calendar_index,
+                    open_events,
+                    events,
+                )
+                for key in ("added", "updated", "unchanged"):
+                    summary[key] += batch_summary[key]
+                if batch_summary["watermark"] is not None and (
+                    summary["watermark"] is None
+                    or batch_summary["watermark"] > summary["watermark"]
+                ):
+                    summary["watermark"] = batch_summary["watermark"]
+
+        if summary["watermark"] is not None:
+            device["event_watermark"] = max(
+                device["event_watermark"], summary["watermark"]
+            )
+        LOGGER.debug(
+            "Calendar update for device %s: added %s, updated %s, unchanged %s",
+            device_id,
+            summary["added"],
+            summary["updated"],
+            summary["unchanged"],
+        )
+        if summary["added"] or summary["updated"]:
+            device["calendar_version"] = device.get("calendar_version", 0) + 1
+            self._calendar_store.async_delay_save(
+                self._calendars_to_store, STORAGE_SAVE_DELAY
             )
 
-            # If the entry exists then update.
-            entry_found = False
-            for existing_event in device_calendar.events:
-                if existing_event.uid == item_event.uid:
-                    entry_found = True
+        # Initiate/ Update the Calendar Store
+        device["calendar"] = device_calendar
+        device["calendar_index"] = calendar_index
+        device["event_summary"] = _event_summary(calendar_index, open_events)
+        return bool(summary["added"] or summary["updated"])
 
-            if entry_found:
+    async def _async_update_device(
+        self, device_id: str, device: dict[str, Any]
+    ) -> None:
+        """Update a single Leakbot device."""
+        lock = self._calendar_locks.setdefault(device_id, asyncio.Lock())
 
-                def apply_edit() -> None:
-                    calendar_events.edit(
-                        uid=event["derived_event_id"],
-                        item=item_event,
-                    )
+        # Status and messages are read every refresh, the water usage and
+        # event history change rarely so are read at the history interval.
+        now = dt.utcnow()
+        last_fetch: dict[str, datetime] = device.setdefault("last_fetch", {})
 
-                await self.hass.async_add_executor_job(apply_edit)
-            else:
-                await self.hass.async_add_executor_job(calendar_events.add, item_event)
+        def due(endpoint: str, interval: timedelta) -> bool:
+            return endpoint not in last_fetch or now - last_fetch[endpoint] >= interval
 
-        # Initiate/ Update the Calendar Store
-        device["calendar"] = device_calendar
+        def history_due(endpoint: str) -> bool:
+            return due(endpoint, self._history_interval)
+
+        # Each endpoint records when it was last fetched or why it failed, a
+        # failed endpoint keeps its last good data and is retried next time.
+        errors: dict[str, str] = device.setdefault("errors", {})
+        failures: list[LeakbotApiClientError] = []
+
+        async def fetch(endpoint: str, request: Awaitable[Any]) -> Any:
+            try:
+                result = await request
+            except LeakbotApiClientAuthenticationError:
+                raise
+            except LeakbotApiClientError as exception:
+                LOGGER.warning(
+                    "Failed to update %s for device %s: %s",
+                    endpoint,
+                    device_id,
+                    exception,
+                )
+                errors[endpoint] = str(exception)
+                failures.append(exception)
+                return None
+            errors.pop(endpoint, None)
+            last_fetch[endpoint] = now
+            return result
+
+        async def update_events() -> bool:
+            # Events are followed closely while a leak is open.
+            if not history_due("events") and not _leak_active(device):
+                return False
+            async with lock:
+                return bool(
+                    await fetch("events", self._async_update_events(device_id, device))
+                )
+
+        messages: dict[str, Any] | UnchangedType | None = None
+        last_message: LeakbotMessage | None = device.get("last_update")
+        if self._adaptive_polling:
+            # Only refresh the device when there is a new message, or the
+            # scan interval has passed since the last full refresh.
+            messages = await fetch(
+                "messages",
+                self._request(self.client.get_device_messages, device_id),
+            )
+            if messages is None:
+                raise failures[0]
+            if (
+                messages is UNCHANGED
+                or LeakbotMessage.from_json(messages) == last_message
+            ) and not due("info", self._scan_interval):
+                # Events are still followed while a leak is open.
+                device["changed"] = await update_events()
+                return
+
+        # The device view, messages and events are independent of each other.
+        requests = [
+            fetch("info", self._request(self.client.get_device_data, device_id)),
+            update_events(),
+        ]
+        if messages is None:
+            requests.append(
+                fetch(
+                    "messages",
+                    self._request(self.client.get_device_messages, device_id),
+                )
+            )
+        info, events_changed, *fetched = await asyncio.gather(*requests)
+        if fetched:
+            messages = fetched[0]
+
+        # Responses are parsed once here, entities skip reprocessing devices
+        # where the parsed data is unchanged. An unchanged response is not
+        # returned again, the model parsed from it is kept instead.
+        changed = events_changed
+        if info is not None:
+            if info is not UNCHANGED:
+                device["reported_info"] = LeakbotDeviceInfo.from_json(info)
+            # Check we have a leak_count_summary, if not guess it.
+            device_info = _guess_leak_free_days(
+                device["reported_info"], device.get("event_summary")
+            )
+            changed = changed or device_info != device.get("info")
+            device["info"] = device_info
+        if messages is not None and messages is not UNCHANGED:
+            last_message = LeakbotMessage.from_json(messages)
+            if last_message is not None:
+                changed = changed or last_message != device.get("last_update")
+                device["last_update"] = last_message
+
+        # Confirm we have data before attempting to load.
+        if last_message is not None:
+            # Water Usage
+            if history_due("water_usage"):
+                water_usage = await fetch(
+                    "water_usage",
+                    self._request(self.client.get_device_water_usage, device_id, 0),
+                )
+                if water_usage is not None and water_usage is not UNCHANGED:
+                    device_water_usage = LeakbotWaterUsage.from_json(water_usage)
+                    changed = changed or device_water_usage != device.get("water_usage")
+                    device["water_usage"] = device_water_usage
+        else:
+            device["device_status"] = "no_data"
+
+        device["changed"] = changed
+
+        # The device failed when nothing could be fetched for it.
+        if failures and now not in last_fetch.values():
+            raise failures[0]
 
     async def _async_update_data(self):
         """Update data via library."""
+        # An expired token is renewed by the client when a request fails.
         if not self._connected:
             await self._client_login()
-        else:
-            try:
-                # Test Token is still valid
-                await self.client.get_account_myread()
-            except LeakbotApiClientTokenError:
-                await self._client_login()
-            except LeakbotApiClientError as exception:
-                raise UpdateFailed(exception) from exception
 
         try:
             result_data = self.data
+            if result_data is not None and self._refresh_account:
+                # Account details requested on demand.
+                account, address, tenant = await asyncio.gather(
+                    self._request(self.client.get_account_myread),
+                    self._request(self.client.get_address_myread),
+                    self._request(self.client.get_tenant_myview),
+                )
+                result_data.update(account=account, address=address, tenant=tenant)
+            self._refresh_account = False
+
             if result_data is None:
-                # First Run.
-                account = await self.client.get_account_myread()
-                address = await self.client.get_address_myread()
-                devices = await self.client.get_device_list()
-                tenant = await self.client.get_tenant_myview()
+                # First Run, nothing is parsed yet so read every response.
+                self.client.reset_fingerprints()
+                account, address, devices, tenant = await asyncio.gather(
+                    self._request(self.client.get_account_myread),
+                    self._request(self.client.get_address_myread),
+                    self._request(self.client.get_device_list),
+                    self._request(self.client.get_tenant_myview),
+                )
 
                 device_data: dict[str, Any] = {}
                 ids = devices["IDs"]
                 for device in ids:
                     device_data[device["id"]] = device
 
+                    # Restore the calendar saved before the last restart.
+                    if device["id"] in self._stored_calendars:
+                        device["calendar"] = self._stored_calendars.pop(device["id"])
+
                 result_data = {
                     "account": account,
                     "address": address,
@@ -203,60 +636,43 @@ class LeakbotDataUpdateCoordinator(DataUpdateCoordinator):
                     "devices": device_data,
                 }
 
-            # Update Device Information and Water Usage
-            for device_id, device in result_data["devices"].items():
-                device["info"] = await self.client.get_device_data(device_id)
+            # Update Device Information and Water Usage, devices in parallel.
+            devices = result_data["devices"]
+            results = await asyncio.gather(
+                *(
+                    self._async_update_device(device_id, device)
+                    for device_id, device in devices.items()
+                ),
+                return_exceptions=True,
+            )
 
-                messages = await self.client.get_device_messages(device_id)
+            failures: list[BaseException] = []
+            for device_id, result in zip(devices, results, strict=True):
+                if isinstance(result, LeakbotApiClientAuthenticationError):
+                    raise result
+                if isinstance(result, (KeyError, TypeError, ValueError)):
+                    # A response that cannot be parsed only fails its device,
+                    # and is read in full again rather than as unchanged.
+                    self.client.reset_fingerprints()
+                    result = LeakbotApiClientError(
+                        None, f"Unexpected response: {result!r}"
+                    )
+                if isinstance(result, LeakbotApiClientError):
+                    LOGGER.warning("Failed to update device %s: %s", device_id, result)
+                    failures.append(result)
+                elif isinstance(result, BaseException):
+                    raise result
 
-                # Confirm we have data before attempting to load.
-                if "record" in messages["list"]:
-                    device["last_update"] = messages["list"]["record"][0]
+            # Only fail the refresh when no device could be updated.
+            if failures and len(failures) == len(devices):
+                raise failures[0]
 
-                    # Water Usage
-                    device["water_usage"] = await self.client.get_device_water_usage(
-                        device_id, 0
-                    )
-                else:
-                    device["device_status"] = "no_data"
-
-                # Update Events
-                async with self._calendar_lock:
-                    await self._async_update_events(device_id, device)
-
-                # Check we have a leak_count_summary, if not guess it.
-                if "leak_count_summary" not in device["info"]:
-                    dev_calendar: Calendar = device.get("calendar", Calendar())
-
-                    # Get first event in the calendar, if it exists, and use that to guess the leak_count_summary.
-                    if dev_calendar.events:
-                        today = datetime.now().date()
-                        event = dev_calendar.events[-1]
-                        install_days = (today - event.start_datetime.date()).days - 1
-                        leak_free_days = install_days
-
-                        # Commenting out as assuming if there is a leak assuming the Summary will appear.
-                        # last_leak = next(
-                        #    (e for e in dev_calendar.events if e.summary == "LeakTrue"),
-                        #    None,
-                        # )
-                        # if last_leak is not None:
-                        #    if (
-                        #        last_leak.start_datetime.date()
-                        #        == last_leak.end_datetime.date()
-                        #    ):
-                        #        leak_free_days = 0
-                        #    else:
-                        #        leak_free_days = (
-                        #            today - last_leak.start_datetime.date()
-                        #        ).days - 1
-
-                        device["info"]["leak_count_summary"] = {
-                            "leak_free_days": str(leak_free_days),
-                            "fix_leak_days": "0",
-                            "paused": "0",
-                        }
+            self.update_interval = self._poll_interval(devices) + self._startup_jitter
+            self._startup_jitter = timedelta(0)
 
             return result_data
+        except LeakbotApiClientAuthenticationError as exception:
+            self._connected = False
+            raise ConfigEntryAuthFailed(exception) from exception
         except LeakbotApiClientError as exception:
             raise UpdateFailed(exception) from exception
@@ -0,0 +1,57 @@
+"""Diagnostics support for Leakbot."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import LeakbotDataUpdateCoordinator
+
+TO_REDACT = {CONF_PASSWORD, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: LeakbotDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "api": coordinator.client.diagnostics,
+        "suppressed_writes": coordinator.suppressed_writes,
+        "devices": {
+            device_id: {
+                "last_fetch": {
+                    endpoint: fetched.isoformat()
+                    for endpoint, fetched in device.get("last_fetch", {}).items()
+                },
+                "errors": device.get("errors", {}),
+                "water_usage_missing_days": coordinator.backfill.missing_days(
+                    device_id
+                ),
+                **_statistics_diagnostics(coordinator, device_id),
+            }
+            for device_id, device in coordinator.data["devices"].items()
+        },
+    }
+
+
+def _statistics_diagnostics(
+    coordinator: LeakbotDataUpdateCoordinator, device_id: str
+) -> dict[str, Any]:
+    """Return the statistics import state of the water history sensor."""
+    if (sensor := coordinator.history_sensors.get(device_id)) is None:
+        return {}
+    return {
+        "statistics_queue_depth": sensor.statistics_queue_depth,
+        "statistics_last_duration": sensor.statistics_last_duration,
+    }
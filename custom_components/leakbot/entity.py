@@ -27,6 +27,7 @@ class LeakbotEntity(CoordinatorEntity):
         """Initialize."""
         super().__init__(coordinator)
         self._device_id = id
+        self._last_snapshot: tuple[Any, ...] | None = None
         self._leakbot_id = self.get_device_data["leakbotId"]
 
         if key:
@@ -42,6 +43,25 @@ class LeakbotEntity(CoordinatorEntity):
                 entity_index = entity_ids.index(self.entity_id)
                 entity_ids.pop(entity_index)
 
+    def _state_snapshot(self) -> tuple[Any, ...]:
+        """Return the values that make up the written state."""
+        return (self.available,)
+
+    async def async_added_to_hass(self) -> None:
+        """Remember the state written when the entity is added."""
+        await super().async_added_to_hass()
+        self._last_snapshot = self._state_snapshot()
+
+    def _handle_coordinator_update(self) -> None:
+        """Write the state only when it has changed."""
+        snapshot = self._state_snapshot()
+        if snapshot == self._last_snapshot:
+            self.coordinator.suppressed_writes += 1
+            return
+
+        self._last_snapshot = snapshot
+        super()._handle_coordinator_update()
+
     @property
     def get_device_data(self) -> dict[str, Any]:
         """Get the device data."""
@@ -0,0 +1,110 @@
+"""Typed models of the Leakbot device data read by the platforms.
+
+Responses are parsed into these once per refresh, keeping only the fields
+the platforms use with numbers and timestamps already converted.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+from .timestamps import parse_timestamp
+
+
+@dataclass(frozen=True, slots=True)
+class LeakbotDeviceInfo:
+    """Device view fields used by the sensors."""
+
+    battery_sm: str | None
+    leak_free_days: int | None
+
+    @classmethod
+    def from_json(cls, info: dict[str, Any]) -> LeakbotDeviceInfo:
+        """Parse the device view, MyView, of a device.
+
+        Leak free days missing from the summary, or null, are left as None.
+        """
+        leak_count_summary = info.get("leak_count_summary") or {}
+        leak_free_days = leak_count_summary.get("leak_free_days")
+        return cls(
+            battery_sm=info.get("battery_sm"),
+            leak_free_days=(
+                None if leak_free_days in (None, "null") else int(leak_free_days)
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class LeakbotMessage:
+    """Newest message sent by a device."""
+
+    timestamp: datetime | None
+
+    @classmethod
+    def from_json(cls, messages: dict[str, Any]) -> LeakbotMessage | None:
+        """Parse the newest message from a message list, None if it is empty."""
+        if "record" not in messages["list"]:
+            return None
+        record = messages["list"]["record"][0]
+        return cls(timestamp=parse_timestamp(record.get("messageTimestamp")))
+
+
+@dataclass(frozen=True, slots=True)
+class LeakbotWaterUsageDay:
+    """Water usage for one day, in 30 minute periods per bucket."""
+
+    offset: int
+    night: float
+    morning: float
+    afternoon: float
+    evening: float
+
+    @classmethod
+    def from_details(cls, offset: int, details: dict[str, Any]) -> LeakbotWaterUsageDay:
+        """Parse the bucket details of a day."""
+        return cls(
+            offset=offset,
+            night=float(details["night"]),
+            morning=float(details["morning"]),
+            afternoon=float(details["afternoon"]),
+            evening=float(details["evening"]),
+        )
+
+    def details(self) -> dict[str, float]:
+        """Return the bucket details of the day."""
+        return {
+            "night": self.night,
+            "morning": self.morning,
+            "afternoon": self.afternoon,
+            "evening": self.evening,
+        }
+
+
+@dataclass(frozen=True, slots=True)
+class LeakbotWaterUsage:
+    """Daily water usage read at ts, newest day first."""
+
+    ts: int
+    days: tuple[LeakbotWaterUsageDay, ...]
+
+    @classmethod
+    def from_json(cls, water_usage: dict[str, Any]) -> LeakbotWaterUsage:
+        """Parse a water usage payload, dropping the friendly strings."""
+        return cls(
+            ts=int(water_usage["ts"]),
+            days=tuple(
+                LeakbotWaterUsageDay.from_details(int(day["offset"]), day["details"])
+                for day in water_usage["days"]
+            ),
+        )
+
+
+@dataclass(frozen=True, slots=True)
+class LeakbotEventSummary:
+    """Summary of the events in a device calendar."""
+
+    count: int
+    first_event: datetime | None
+    leak_active: bool
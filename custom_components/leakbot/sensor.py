@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import asyncio
+import time
 
 from .entity import LeakbotEntity
 from .coordinator import LeakbotDataUpdateCoordinator
@@ -37,6 +38,8 @@ from homeassistant.helpers.typing import StateType
 from homeassistant.util import slugify, dt
 
 from .const import LOGGER
+from .models import LeakbotWaterUsage
+from .water_usage import water_usage_to_columns
 
 
 @dataclass(frozen=True)
@@ -45,6 +48,8 @@ class LeakbotSensorEntityDescription(SensorEntityDescription):
 
     data_type: str = "str"
     lookup_keys: str | None = None
+    attribute: str | None = None
+    endpoint: str | None = None
 
 
 ENTITY_DESCRIPTIONS = (
@@ -56,13 +61,15 @@ ENTITY_DESCRIPTIONS = (
     ),
     LeakbotSensorEntityDescription(
         lookup_keys="info",
+        endpoint="info",
         key="battery_sm",
         translation_key="battery_sm",
         has_entity_name=True,
         icon="mdi:battery",
     ),
     LeakbotSensorEntityDescription(
-        lookup_keys="info.leak_count_summary",
+        lookup_keys="info",
+        endpoint="info",
         key="leak_free_days",
         translation_key="leak_free_days",
         has_entity_name=True,
@@ -75,6 +82,8 @@ ENTITY_DESCRIPTIONS = (
     ),
     LeakbotSensorEntityDescription(
         lookup_keys="last_update",
+        attribute="timestamp",
+        endpoint="messages",
         key="messageTimestamp",
         translation_key="last_update",
         has_entity_name=True,
@@ -136,39 +145,68 @@ class LeakbotSensor(LeakbotEntity, SensorEntity):
         )
         self.entity_description: LeakbotSensorEntityDescription = entity_description
 
+        # Path to the value in the device data, split once.
+        self._lookup_path: tuple[str, ...] = (
+            *(
+                entity_description.lookup_keys.split(".")
+                if entity_description.lookup_keys
+                else ()
+            ),
+            entity_description.attribute or entity_description.key,
+        )
+        self._data_available = False
+        self._value: StateType | date | datetime | Decimal = None
+        self._update_value()
+
+    def _update_value(self) -> None:
+        """Look up and convert the value from the latest device data."""
+        # The device entry is a dict holding the parsed models.
+        try:
+            return_value = self.get_device_data
+            for sub_key in self._lookup_path:
+                if isinstance(return_value, dict):
+                    return_value = return_value[sub_key]
+                else:
+                    return_value = getattr(return_value, sub_key)
+        except (AttributeError, KeyError, TypeError):
+            return_value = None
+        if return_value is None:
+            self._data_available = False
+            self._value = None
+            return
+
+        self._data_available = True
+        match self.entity_description.data_type:
+            case "int":
+                self._value = int(return_value)
+            case "timestamp":
+                # Parsed when the message was read.
+                self._value = return_value
+            case _:
+                self._value = slugify(return_value)
+
+    def _state_snapshot(self) -> tuple[Any, ...]:
+        """Return the values that make up the written state."""
+        return (self.available, self._value)
+
+    def _handle_coordinator_update(self) -> None:
+        """Handle the update from the coordinator."""
+        if self.get_device_data.get("changed", True):
+            self._update_value()
+        super()._handle_coordinator_update()
+
     @property
     def available(self) -> bool:
         """Checks the Keys and data to make sure things are available."""
-        sub_data = self.get_device_data
-
-        if self.entity_description.lookup_keys:
-            try:
-                for sub_key in self.entity_description.lookup_keys.split("."):
-                    sub_data = sub_data[sub_key]
-            except Exception:
-                return False
-
-        return self._attr_available
+        endpoint = self.entity_description.endpoint
+        if endpoint and not self.coordinator.is_fresh(self._device_id, endpoint):
+            return False
+        return self._data_available and self._attr_available
 
     @property
     def native_value(self) -> StateType | date | datetime | Decimal:
         """Return the native value of the sensor."""
-        sub_data = self.get_device_data
-
-        # Get the Data Subset.
-        if self.entity_description.lookup_keys:
-            for sub_key in self.entity_description.lookup_keys.split("."):
-                sub_data = sub_data[sub_key]
-
-        return_value = sub_data[self.entity_description.key]
-        match self.entity_description.data_type:
-            case "int":
-                return int(return_value)
-            case "timestamp":
-                # Format: "2022-03-19 13:10:18"
-                return datetime.fromisoformat(f"{return_value}+00:00")
-            case _:
-                return slugify(return_value)
+        return self._value
 
 
 class LeakbotWaterHistorySensor(LeakbotEntity, SensorEntity):
@@ -187,6 +225,17 @@ class LeakbotWaterHistorySensor(LeakbotEntity, SensorEntity):
         self.entity_description: LeakbotSensorEntityDescription = entity_description
         self._attr_state = None
 
+        # Last imported statistic, seeded from the database once when added.
+        self._statistics_sum: float = 0
+        self._statistics_since: datetime = dt.utc_from_timestamp(0)
+        self._water_usage_ts: int | None = None
+
+        # Statistics imports run one at a time, with updates arriving while
+        # one runs merged into a single queued run.
+        self._statistics_lock = asyncio.Lock()
+        self._statistics_queued = False
+        self.statistics_last_duration: float | None = None
+
     @property
     def native_value(self) -> StateType | date | datetime | Decimal:
         """Return the native value of the sensor."""
@@ -196,22 +245,47 @@ class LeakbotWaterHistorySensor(LeakbotEntity, SensorEntity):
 
     async def async_added_to_hass(self) -> None:
         """Handle the addition of the sensor to Home Assistant."""
-        # Perform initial statistic import when sensor is added.
-        await self.update_statistics()
+        # Perform initial statistic import when sensor is added, in the
+        # background so it does not hold up the setup.
+        await self.load_last_statistics()
+        self._schedule_statistics()
+
+        history_sensors = self.coordinator.history_sensors
+        history_sensors[self._device_id] = self
+        self.async_on_remove(lambda: history_sensors.pop(self._device_id, None))
         return await super().async_added_to_hass()
 
+    @property
+    def statistics_queue_depth(self) -> int:
+        """Return the number of statistics imports running or queued."""
+        return int(self._statistics_lock.locked()) + int(self._statistics_queued)
+
     def _handle_coordinator_update(self) -> None:
         """Handle the update from the coordinator."""
-        asyncio.run_coroutine_threadsafe(self.update_statistics(), self.hass.loop)
+        self._schedule_statistics()
 
-    async def update_statistics(self) -> None:
-        """Update the statistics for the water usage sensor."""
-        # Update the statistics for the water usage sensor.
-        # This is a historical sensor and does not have a current state.
-        statistic_id = self.entity_id
-        statistics_sum = 0
-        statistics_since = datetime.fromtimestamp(0)
+    def _schedule_statistics(self) -> None:
+        """Queue a statistics import unless one is already queued."""
+        if self._statistics_queued:
+            return
+
+        self._statistics_queued = True
+        self.hass.async_create_task(
+            self._async_statistics_worker(),
+            f"{self.entity_id} statistics import",
+        )
+
+    async def _async_statistics_worker(self) -> None:
+        """Run a statistics import, never more than one at a time."""
+        async with self._statistics_lock:
+            self._statistics_queued = False
+            started = time.monotonic()
+            await self.update_statistics()
+            self.statistics_last_duration = time.monotonic() - started
 
+    async def load_last_statistics(self) -> None:
+        """Load the last imported sum and end time from the database."""
+        statistic_id = self.entity_id
         last_stats = await get_instance(self.hass).async_add_executor_job(
             get_last_statistics,
             self.hass,
@@ -222,61 +296,44 @@ class LeakbotWaterHistorySensor(LeakbotEntity, SensorEntity):
         )
 
         if last_stats:
-            statistics_sum = last_stats[statistic_id][0].get("sum") or 0
-            statistics_since = datetime.fromtimestamp(
+            self._statistics_sum = last_stats[statistic_id][0].get("sum") or 0
+            self._statistics_since = dt.utc_from_timestamp(
                 last_stats[statistic_id][0].get("end") or 0
             )
 
+    async def update_statistics(self) -> None:
+        """Update the statistics for the water usage sensor."""
+        # Update the statistics for the water usage sensor.
+        # This is a historical sensor and does not have a current state.
+        water_usage: LeakbotWaterUsage | None = self.get_device_data.get(
+            self.entity_description.key
+        )
+        if water_usage is None or water_usage.ts == self._water_usage_ts:
+            return
+
+        statistic_id = self.entity_id
+        statistics_sum = self._statistics_sum
+        statistics_since = self._statistics_since
+
+        # A gap since the last import is filled as far back as the reading
+        # reaches, older days are reported as missing.
+        self.coordinator.backfill.check(self._device_id, water_usage, statistics_since)
+
         # Last Start: 2025-04-05 18:00:00 :: End 2025-04-05 18:00:00
-        water_usage = self.get_device_data[self.entity_description.key]
-        query_date = dt.as_local(datetime.fromtimestamp(water_usage["ts"] / 1000))
+        query_date = dt.as_local(datetime.fromtimestamp(water_usage.ts / 1000))
         query_date = query_date.replace(hour=0, minute=0, second=0, microsecond=0)
 
-        update_happened = False
-        new_stats = []
-        for day in reversed(water_usage["days"]):
-            start_date = query_date + timedelta(days=int(day["offset"]))
-            if start_date > dt.as_local(statistics_since):
-                update_happened = True
-
-                statistics_sum += float(day["details"]["night"]) / 2
-                new_stats.append(
-                    StatisticData(
-                        start=query_date.replace(hour=0)
-                        + timedelta(days=int(day["offset"])),
-                        state=float(day["details"]["night"]) / 2,
-                        sum=statistics_sum,
-                    )
-                )
-                statistics_sum += float(day["details"]["morning"]) / 2
-                new_stats.append(
-                    StatisticData(
-                        start=query_date.replace(hour=6)
-                        + timedelta(days=int(day["offset"])),
-                        state=float(day["details"]["morning"]) / 2,
-                        sum=statistics_sum,
-                    )
-                )
-                statistics_sum += float(day["details"]["afternoon"]) / 2
-                new_stats.append(
-                    StatisticData(
-                        start=query_date.replace(hour=12)
-                        + timedelta(days=int(day["offset"])),
-                        state=float(day["details"]["afternoon"]) / 2,
-                        sum=statistics_sum,
-                    )
-                )
-                statistics_sum += float(day["details"]["evening"]) / 2
-                new_stats.append(
-                    StatisticData(
-                        start=query_date.replace(hour=18)
-                        + timedelta(days=int(day["offset"])),
-                        state=float(day["details"]["evening"]) / 2,
-                        sum=statistics_sum,
-                    )
-                )
+        columns = water_usage_to_columns(
+            water_usage, query_date, statistics_since, statistics_sum
+        )
+        new_stats = [
+            StatisticData(start=start, state=state, sum=total)
+            for start, state, total in zip(
+                columns.start, columns.state, columns.sum, strict=True
+            )
+        ]
 
-        if update_happened:
+        if new_stats:
             # Import the statistics into the database.
             new_stats_meta = StatisticMetaData(
                 mean_type=StatisticMeanType.NONE,
@@ -288,3 +345,9 @@ class LeakbotWaterHistorySensor(LeakbotEntity, SensorEntity):
                 unit_class=None,
             )
             async_import_statistics(self.hass, new_stats_meta, new_stats)
+
+            # Statistics are hourly, so the last one ends an hour after it starts.
+            self._statistics_sum = columns.sum[-1]
+            self._statistics_since = new_stats[-1]["start"] + timedelta(hours=1)
+
+        self._water_usage_ts = water_usage.ts
@@ -0,0 +1,67 @@
+"""Shared aiohttp session and rate limiter for the Leakbot API."""
+
+from __future__ import annotations
+
+from aiohttp import ClientSession, TCPConnector
+
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+from homeassistant.util.ssl import get_default_context
+
+from .api import API_URL, LeakbotRateLimiter
+from .const import (
+    DATA_LIMITER,
+    DATA_SESSIONS,
+    SESSION_DNS_CACHE_TTL,
+    SESSION_KEEPALIVE_TIMEOUT,
+    SESSION_LIMIT_PER_HOST,
+)
+
+
+@callback
+def async_get_leakbot_session(
+    hass: HomeAssistant, host: str = API_URL
+) -> ClientSession:
+    """Return the session for a Leakbot host, creating it on first use.
+
+    The session is shared by the config flow, reauth and every config entry
+    so connections to the host are kept alive and reused. It is closed when
+    the last config entry unloads or Home Assistant closes.
+    """
+    sessions: dict[str, ClientSession] = hass.data.setdefault(DATA_SESSIONS, {})
+    if (session := sessions.get(host)) is not None and not session.closed:
+        return session
+
+    session = ClientSession(
+        connector=TCPConnector(
+            limit_per_host=SESSION_LIMIT_PER_HOST,
+            keepalive_timeout=SESSION_KEEPALIVE_TIMEOUT,
+            ttl_dns_cache=SESSION_DNS_CACHE_TTL,
+            ssl=get_default_context(),
+        ),
+        headers={"User-Agent": SERVER_SOFTWARE},
+    )
+    sessions[host] = session
+
+    async def _async_close_session(event: Event) -> None:
+        """Close the session when Home Assistant closes."""
+        await session.close()
+
+    hass.bus.async_listen_once(EVENT_HOMEASSISTANT_CLOSE, _async_close_session)
+    return session
+
+
+async def async_close_leakbot_sessions(hass: HomeAssistant) -> None:
+    """Close the shared sessions, used when the last config entry unloads."""
+    sessions: dict[str, ClientSession] = hass.data.pop(DATA_SESSIONS, {})
+    for session in sessions.values():
+        await session.close()
+
+
+@callback
+def async_get_leakbot_limiter(hass: HomeAssistant) -> LeakbotRateLimiter:
+    """Return the rate limiter shared by every Leakbot config entry."""
+    if (limiter := hass.data.get(DATA_LIMITER)) is None:
+        limiter = hass.data[DATA_LIMITER] = LeakbotRateLimiter()
+    return limiter
@@ -0,0 +1,33 @@
+"""Decoding of the timestamps returned by the Leakbot API."""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime, tzinfo
+
+from homeassistant.util import dt
+
+# Leakbot timestamps are UTC in the fixed format "2022-03-19 13:10:18",
+# a missing timestamp, such as an open event's closed time, is "null".
+NULL_TIMESTAMP = "null"
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+
+def parse_timestamp(value: str | None) -> datetime | None:
+    """Return a Leakbot timestamp as a UTC datetime, None for null."""
+    if value is None or value == NULL_TIMESTAMP:
+        return None
+    # The fixed format is a subset of ISO 8601, fromisoformat is much faster
+    # than strptime for it.
+    return datetime.fromisoformat(value).replace(tzinfo=UTC)
+
+
+def parse_local_timestamp(
+    value: str | None, local_tz: tzinfo | None = None
+) -> datetime | None:
+    """Return a Leakbot timestamp in the local time zone, None for null.
+
+    Pass local_tz when parsing many timestamps to look the time zone up once.
+    """
+    if (parsed := parse_timestamp(value)) is None:
+        return None
+    return parsed.astimezone(local_tz or dt.get_default_time_zone())
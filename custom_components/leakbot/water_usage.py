@@ -0,0 +1,54 @@
+"""Convert Leakbot water usage into long term statistics."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+from .models import LeakbotWaterUsage
+
+# Each day is reported in four buckets, the hour each one starts at.
+WATER_USAGE_BUCKETS: tuple[tuple[str, timedelta], ...] = (
+    ("night", timedelta(hours=0)),
+    ("morning", timedelta(hours=6)),
+    ("afternoon", timedelta(hours=12)),
+    ("evening", timedelta(hours=18)),
+)
+
+# Leakbot counts 30 minute periods, statistics are recorded in hours.
+UNITS_PER_HOUR = 2
+
+
+@dataclass
+class WaterUsageColumns:
+    """Water usage statistics as start, state and sum columns."""
+
+    start: list[datetime] = field(default_factory=list)
+    state: list[float] = field(default_factory=list)
+    sum: list[float] = field(default_factory=list)
+
+
+def water_usage_to_columns(
+    water_usage: LeakbotWaterUsage,
+    query_date: datetime,
+    since: datetime,
+    statistics_sum: float,
+) -> WaterUsageColumns:
+    """Convert the days in a water usage payload newer than since to columns.
+
+    query_date is midnight on the day the water usage was read, day offsets
+    are relative to it. The sum column carries on from statistics_sum.
+    """
+    columns = WaterUsageColumns()
+    for day in reversed(water_usage.days):
+        day_start = query_date + timedelta(days=day.offset)
+        if day_start <= since:
+            continue
+
+        for bucket, hour in WATER_USAGE_BUCKETS:
+            columns.start.append(day_start + hour)
+            columns.state.append(getattr(day, bucket) / UNITS_PER_HOUR)
+
+    columns.sum = list(accumulate(columns.state, initial=statistics_sum))[1:]
+    return columns
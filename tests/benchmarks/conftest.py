@@ -0,0 +1,367 @@
+"""Benchmark Configuration, a mock Leakbot API serving synthetic accounts.
+
+Benchmarks only run when LEAKBOT_BENCHMARK is set, the options are:
+
+    LEAKBOT_BENCHMARK_ACCOUNTS  Accounts as DEVICESxEVENTSxDAYS, comma separated.
+    LEAKBOT_BENCHMARK_ROUNDS    Rounds timed for each measurement.
+    LEAKBOT_BENCHMARK_SAVE      File the results are saved to, by default
+                                .benchmarks/<commit>.json
+    LEAKBOT_BENCHMARK_COMPARE   Results file from an earlier run to compare to.
+"""
+
+import aiohttp
+import json
+import os
+import random
+import subprocess
+
+from aiohttp.web import Application, Request, Response
+from collections.abc import AsyncGenerator, Callable
+from datetime import UTC, datetime, timedelta
+from typing import Any, NamedTuple
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.components.http.forwarded import async_setup_forwarded
+
+from custom_components.leakbot.api import (
+    API_LOGIN,
+    API_ACCOUNT_MYREAD,
+    API_ADDRESS_MYREAD,
+    API_DEVICE_LIST,
+    API_DEVICE_MYVIEW,
+    API_TENANT_MYVIEW,
+    API_DEVICE_MYMSG,
+    API_DEVICE_WATERUSAGE,
+    API_DEVICE_MYSIMPLEMSG,
+    LeakbotApiClient,
+)
+from custom_components.leakbot.timestamps import NULL_TIMESTAMP, TIMESTAMP_FORMAT
+
+from ..conftest import (
+    VALID_LOGIN,
+    ClientSessionGenerator,
+    LeakbotAPIMock,
+    load_fixture,
+)
+
+BENCHMARK_ENABLED = bool(os.environ.get("LEAKBOT_BENCHMARK"))
+BENCHMARK_ACCOUNTS = os.environ.get(
+    "LEAKBOT_BENCHMARK_ACCOUNTS", "1x50x28,5x1000x28,20x5000x90"
+)
+BENCHMARK_ROUNDS = int(os.environ.get("LEAKBOT_BENCHMARK_ROUNDS", "20"))
+BENCHMARK_SAVE = os.environ.get("LEAKBOT_BENCHMARK_SAVE")
+BENCHMARK_COMPARE = os.environ.get("LEAKBOT_BENCHMARK_COMPARE")
+
+# Synthetic events are spread over this period before now.
+EVENT_HISTORY = timedelta(days=730)
+EVENT_CODES = ("HighFlow", "LeakTrue", "LeakFalse", "LowSignal", "HasSignal")
+MESSAGE_COUNT = 50
+
+# Results of the benchmarks run in this session, by account then metric.
+BENCHMARK_RESULTS: dict[str, dict[str, float]] = {}
+
+
+class SyntheticAccount(NamedTuple):
+    """Size of a synthetic account."""
+
+    devices: int
+    events: int
+    days: int
+
+    def __str__(self) -> str:
+        """Return the account as DEVICESxEVENTSxDAYS."""
+        return f"{self.devices}x{self.events}x{self.days}"
+
+    @classmethod
+    def from_str(cls, value: str) -> "SyntheticAccount":
+        """Parse an account from DEVICESxEVENTSxDAYS."""
+        devices, events, days = (int(part) for part in value.split("x"))
+        return cls(devices, events, days)
+
+
+def benchmark_accounts() -> list[SyntheticAccount]:
+    """Return the accounts to benchmark."""
+    return [
+        SyntheticAccount.from_str(account.strip())
+        for account in BENCHMARK_ACCOUNTS.split(",")
+        if account.strip()
+    ]
+
+
+def record_benchmark(account: SyntheticAccount, metric: str, value: float) -> None:
+    """Record a benchmark result to be reported and saved."""
+    BENCHMARK_RESULTS.setdefault(str(account), {})[metric] = value
+
+
+def _synthetic_device(
+    rng: random.Random, index: int, account: SyntheticAccount, now: datetime
+) -> dict[str, Any]:
+    """Generate the payloads of a synthetic device."""
+    ts = int(now.timestamp() * 1000)
+
+    # Events newest first, spread evenly over the history.
+    spacing = EVENT_HISTORY / max(account.events, 1)
+    events = []
+    for number in range(account.events):
+        created = now - spacing * number - timedelta(minutes=rng.randint(1, 60))
+        closed = min(created + timedelta(minutes=rng.randint(1, 180)), now)
+        events.append(
+            {
+                "crm_business_created": NULL_TIMESTAMP,
+                "crm_business_name": NULL_TIMESTAMP,
+                "derived_event_closed": closed.strftime(TIMESTAMP_FORMAT),
+                "derived_event_code": rng.choice(EVENT_CODES),
+                "derived_event_created": created.strftime(TIMESTAMP_FORMAT),
+                "derived_event_id": f"{index}{number:08d}",
+                "interaction_flag": NULL_TIMESTAMP,
+            }
+        )
+
+    messages = {
+        "LastPage": "true",
+        "list": {
+            "record": [
+                {
+                    "event_type": "2",
+                    "id": f"{index}{number:08d}",
+                    "messageTimestamp": (now - timedelta(minutes=15 * number)).strftime(
+                        TIMESTAMP_FORMAT
+                    ),
+                    "msg_type": "9",
+                }
+                for number in range(MESSAGE_COUNT)
+            ]
+        },
+        "ts": ts,
+        "ms": 100,
+    }
+
+    days = []
+    for number in range(account.days):
+        details = {
+            bucket: str(rng.randint(0, 12))
+            for bucket in ("night", "morning", "afternoon", "evening")
+        }
+        details["total"] = str(sum(int(value) for value in details.values()))
+        days.append(
+            {
+                "details": details,
+                "dayNumber": str((now - timedelta(days=number + 1)).weekday()),
+                "totalFriendly": "M",
+                "morningFriendly": "L",
+                "afternoonFriendly": "M",
+                "eveningFriendly": "L",
+                "nightFriendly": "L",
+                "offset": str(-number - 1),
+            }
+        )
+
+    myview = json.loads(load_fixture("device_myview_123456.json"))
+    return {
+        "myview": json.dumps({**myview, "ts": ts}),
+        "messages": json.dumps(messages),
+        "water_usage": json.dumps({"days": days, "stats": {}, "ts": ts}),
+        "events": events,
+    }
+
+
+class SyntheticLeakbotAPIMock(LeakbotAPIMock):
+    """Mock the Leakbot API serving a generated account."""
+
+    def __init__(self, account: SyntheticAccount) -> None:
+        """Generate the account payloads up front so they are not timed."""
+        super().__init__()
+        rng = random.Random(str(account))
+        now = datetime.now(UTC).replace(microsecond=0)
+        self.requests = 0
+
+        self._devices = {
+            str(100000 + index): _synthetic_device(rng, index, account, now)
+            for index in range(account.devices)
+        }
+        self._device_list = json.dumps(
+            {
+                "IDs": [
+                    {
+                        "device_status": "Leak Inactive",
+                        "device_type": "WIFILeakBotV3",
+                        "fw_version": "3.30",
+                        "id": device_id,
+                        "leakbotId": f"5B{int(device_id):06X}",
+                        "tenant_id": "123",
+                    }
+                    for device_id in self._devices
+                ],
+                "ts": int(now.timestamp() * 1000),
+                "ms": 100,
+            }
+        )
+        self._event_lists: dict[tuple[str, str], str] = {}
+
+    def _event_list(self, device_id: str, starting_date: str) -> str:
+        """Return the events changed since the starting date."""
+        key = (device_id, starting_date)
+        if key not in self._event_lists:
+            self._event_lists[key] = json.dumps(
+                {
+                    "events": [
+                        event
+                        for event in self._devices[device_id]["events"]
+                        if event["derived_event_created"] >= starting_date
+                        or event["derived_event_closed"] >= starting_date
+                    ],
+                    "ts": 0,
+                    "ms": 100,
+                }
+            )
+        return self._event_lists[key]
+
+    async def _respond(
+        self, request: Request, payload: Callable[[dict[str, Any]], str]
+    ) -> Response:
+        """Respond with the payload when the token is valid."""
+        data = await request.json()
+        self.requests += 1
+
+        if self._token == data["token"] and self._token == request.cookies.get(
+            "lctoken"
+        ):
+            response_text = payload(data)
+        else:
+            response_text = load_fixture("account_invalid_token.json")
+
+        return Response(text=response_text, content_type="application/json")
+
+    async def device_mydevicelist(self, request: Request) -> Response:
+        """Mock API to get devices."""
+        return await self._respond(request, lambda data: self._device_list)
+
+    async def device_myview(self, request: Request) -> Response:
+        """Mock API to get Device Data."""
+        return await self._respond(
+            request, lambda data: self._devices[data["LbDevice_ID"]]["myview"]
+        )
+
+    async def device_messages(self, request: Request) -> Response:
+        """Mock API to get Device Messages."""
+        return await self._respond(
+            request, lambda data: self._devices[data["LbDevice_ID"]]["messages"]
+        )
+
+    async def device_waterusage(self, request: Request) -> Response:
+        """Mock API to get Device Water Usage."""
+        return await self._respond(
+            request, lambda data: self._devices[data["LbDevice_ID"]]["water_usage"]
+        )
+
+    async def device_simpleeventlist(self, request: Request) -> Response:
+        """Mock API to get Device Simple Event List."""
+        return await self._respond(
+            request,
+            lambda data: self._event_list(data["LbDevice_ID"], data["starting_date"]),
+        )
+
+
+@pytest.fixture
+def account(request: pytest.FixtureRequest) -> SyntheticAccount:
+    """Return the synthetic account being benchmarked."""
+    return request.param
+
+
+@pytest.fixture
+def synthetic_api(account: SyntheticAccount) -> SyntheticLeakbotAPIMock:
+    """Generate the mock API for the account."""
+    return SyntheticLeakbotAPIMock(account)
+
+
+@pytest.fixture
+async def synthetic_leakbot_api(
+    hass: HomeAssistant, synthetic_api: SyntheticLeakbotAPIMock
+) -> Application:
+    """Mock the Leakbot API with the synthetic account."""
+    app = Application()
+    app["hass"] = hass
+
+    api = synthetic_api
+    app.router.add_route("POST", API_LOGIN, api.account_mylogin)
+    app.router.add_route("POST", API_DEVICE_LIST, api.device_mydevicelist)
+    app.router.add_route("POST", API_ACCOUNT_MYREAD, api.account_myread)
+    app.router.add_route("POST", API_ADDRESS_MYREAD, api.address_myread)
+    app.router.add_route("POST", API_TENANT_MYVIEW, api.tenant_myview)
+    app.router.add_route("POST", API_DEVICE_MYVIEW, api.device_myview)
+    app.router.add_route("POST", API_DEVICE_MYMSG, api.device_messages)
+    app.router.add_route("POST", API_DEVICE_WATERUSAGE, api.device_waterusage)
+    app.router.add_route("POST", API_DEVICE_MYSIMPLEMSG, api.device_simpleeventlist)
+
+    async_setup_forwarded(app, True, [])
+    return app
+
+
+@pytest.fixture
+async def synthetic_api_client(
+    synthetic_leakbot_api: Application, aiohttp_client: ClientSessionGenerator
+) -> AsyncGenerator[LeakbotApiClient]:
+    """LeakbotApiClient wired up to the synthetic test server."""
+    test_client = await aiohttp_client(synthetic_leakbot_api)
+    async with aiohttp.ClientSession(base_url=test_client.make_url("/")) as session:
+        yield LeakbotApiClient(
+            VALID_LOGIN["username"], VALID_LOGIN["password"], session
+        )
+
+
+def _git_commit(rootpath: str) -> str:
+    """Return the short hash of the commit being benchmarked."""
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=rootpath,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+    return result.stdout.strip()
+
+
+def pytest_terminal_summary(  # pylint: disable=unused-argument
+    terminalreporter, exitstatus, config
+) -> None:
+    """Report the benchmark results, compare and save them."""
+    if not BENCHMARK_RESULTS:
+        return
+
+    baseline: dict[str, dict[str, float]] = {}
+    if BENCHMARK_COMPARE:
+        with open(BENCHMARK_COMPARE, encoding="utf-8") as fptr:
+            baseline = json.load(fptr)["results"]
+
+    # Metrics ending _per_s are better higher, all others better lower.
+    terminalreporter.section("leakbot benchmarks")
+    for account, metrics in BENCHMARK_RESULTS.items():
+        for metric, value in sorted(metrics.items()):
+            line = f"{account:>16} {metric:<28} {value:>14.6g}"
+            if base := baseline.get(account, {}).get(metric):
+                line += f" {value / base:>8.2f}x baseline"
+            terminalreporter.write_line(line)
+
+    commit = _git_commit(str(config.rootpath))
+    path = BENCHMARK_SAVE or os.path.join(
+        config.rootpath, ".benchmarks", f"{commit}.json"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as fptr:
+        json.dump(
+            {
+                "commit": commit,
+                "created": datetime.now(UTC).isoformat(),
+                "rounds": BENCHMARK_ROUNDS,
+                "results": BENCHMARK_RESULTS,
+            },
+            fptr,
+            indent=2,
+            sort_keys=True,
+        )
+    terminalreporter.write_line(f"Saved benchmark results to {path}")
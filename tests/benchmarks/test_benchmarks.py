@@ -0,0 +1,212 @@
+"""Benchmark the Leakbot coordinator, calendar and statistics conversion."""
+
+import gc
+import random
+import statistics
+import time
+import tracemalloc
+
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.leakbot.api import LeakbotApiClient
+from custom_components.leakbot.calendar import EventIntervalIndex
+from custom_components.leakbot.const import DOMAIN
+from custom_components.leakbot.coordinator import (
+    HISTORY_ENDPOINTS,
+    LeakbotDataUpdateCoordinator,
+)
+from custom_components.leakbot.water_usage import water_usage_to_columns
+
+from ..conftest import VALID_LOGIN
+from .conftest import (
+    BENCHMARK_ENABLED,
+    BENCHMARK_ROUNDS,
+    SyntheticAccount,
+    SyntheticLeakbotAPIMock,
+    benchmark_accounts,
+    record_benchmark,
+)
+
+pytestmark = [
+    pytest.mark.skipif(
+        not BENCHMARK_ENABLED, reason="Set LEAKBOT_BENCHMARK=1 to run benchmarks."
+    ),
+    pytest.mark.parametrize("account", benchmark_accounts(), ids=str, indirect=True),
+    # Calendar saves are delayed, so leave timers behind.
+    pytest.mark.parametrize("expected_lingering_timers", [True]),
+]
+
+
+async def _first_sync(
+    hass: HomeAssistant, client: LeakbotApiClient
+) -> LeakbotDataUpdateCoordinator:
+    """Set up a coordinator and run its first refresh."""
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    coordinator = LeakbotDataUpdateCoordinator(hass, client, entry, 15)
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    return coordinator
+
+
+def _new_client(client: LeakbotApiClient) -> LeakbotApiClient:
+    """Return a new client on the same session, with nothing cached."""
+    return LeakbotApiClient(
+        VALID_LOGIN["username"], VALID_LOGIN["password"], client._session
+    )
+
+
+def _p95(timings: list[float]) -> float:
+    """Return the 95th percentile of the timings."""
+    if len(timings) < 2:
+        return timings[0]
+    return statistics.quantiles(timings, n=20)[-1]
+
+
+async def test_first_sync(
+    hass: HomeAssistant,
+    account: SyntheticAccount,
+    synthetic_api: SyntheticLeakbotAPIMock,
+    synthetic_api_client: LeakbotApiClient,
+):
+    """Benchmark the first refresh, reading every event and water usage."""
+    timings: list[float] = []
+    for _ in range(max(BENCHMARK_ROUNDS // 5, 1)):
+        # Each round is a first sync, so nothing is kept from the last one.
+        client = _new_client(synthetic_api_client)
+        synthetic_api.requests = 0
+        started = time.perf_counter()
+        coordinator = await _first_sync(hass, client)
+        timings.append(time.perf_counter() - started)
+
+    assert len(coordinator.data["devices"]) == account.devices
+    record_benchmark(account, "first_sync_s", statistics.median(timings))
+    record_benchmark(account, "first_sync_requests", synthetic_api.requests)
+
+
+async def test_update_data(
+    hass: HomeAssistant,
+    account: SyntheticAccount,
+    synthetic_api: SyntheticLeakbotAPIMock,
+    synthetic_api_client: LeakbotApiClient,
+):
+    """Benchmark refreshes once synced, with and without the history due."""
+    coordinator = await _first_sync(hass, synthetic_api_client)
+
+    synthetic_api.requests = 0
+    timings: list[float] = []
+    for _ in range(BENCHMARK_ROUNDS):
+        started = time.perf_counter()
+        await coordinator._async_update_data()
+        timings.append(time.perf_counter() - started)
+
+    record_benchmark(account, "update_median_s", statistics.median(timings))
+    record_benchmark(account, "update_p95_s", _p95(timings))
+    record_benchmark(
+        account, "update_requests", synthetic_api.requests / BENCHMARK_ROUNDS
+    )
+
+    # Forget when the history was fetched so every refresh reads it.
+    timings = []
+    for _ in range(BENCHMARK_ROUNDS):
+        for device in coordinator.data["devices"].values():
+            for endpoint in HISTORY_ENDPOINTS:
+                device["last_fetch"].pop(endpoint, None)
+        started = time.perf_counter()
+        await coordinator._async_update_data()
+        timings.append(time.perf_counter() - started)
+
+    record_benchmark(account, "history_update_median_s", statistics.median(timings))
+
+
+async def test_calendar_query(
+    hass: HomeAssistant,
+    account: SyntheticAccount,
+    synthetic_api_client: LeakbotApiClient,
+):
+    """Benchmark building the calendar index and querying a week of events."""
+    coordinator = await _first_sync(hass, synthetic_api_client)
+    device = next(iter(coordinator.data["devices"].values()))
+    events = list(device["calendar"].events)
+
+    started = time.perf_counter()
+    index = EventIntervalIndex(events)
+    record_benchmark(account, "calendar_index_s", time.perf_counter() - started)
+
+    # Random weeks across the event history, as a calendar card would ask.
+    rng = random.Random(str(account))
+    newest = dt.now()
+    oldest = min((event.start for event in events), default=newest)
+    span = max((newest - oldest).total_seconds(), 1)
+
+    timings: list[float] = []
+    for _ in range(BENCHMARK_ROUNDS * 10):
+        start = oldest + timedelta(seconds=rng.uniform(0, span))
+        started = time.perf_counter()
+        index.overlapping(start, start + timedelta(days=7))
+        timings.append(time.perf_counter() - started)
+
+    record_benchmark(
+        account, "calendar_query_median_us", statistics.median(timings) * 1e6
+    )
+
+
+async def test_statistics_conversion(
+    hass: HomeAssistant,
+    account: SyntheticAccount,
+    synthetic_api_client: LeakbotApiClient,
+):
+    """Benchmark converting the water usage of every device to statistics."""
+    coordinator = await _first_sync(hass, synthetic_api_client)
+    water_usages = [
+        device["water_usage"] for device in coordinator.data["devices"].values()
+    ]
+    since = dt.utc_from_timestamp(0)
+
+    rows = 0
+    started = time.perf_counter()
+    for _ in range(BENCHMARK_ROUNDS):
+        for water_usage in water_usages:
+            query_date = dt.as_local(dt.utc_from_timestamp(water_usage.ts / 1000))
+            query_date = query_date.replace(hour=0, minute=0, second=0, microsecond=0)
+            columns = water_usage_to_columns(water_usage, query_date, since, 0)
+            rows += len(columns.start)
+    elapsed = time.perf_counter() - started
+
+    assert rows == BENCHMARK_ROUNDS * account.devices * account.days * 4
+    record_benchmark(account, "statistics_rows_per_s", rows / elapsed)
+
+
+async def test_memory(
+    hass: HomeAssistant,
+    account: SyntheticAccount,
+    synthetic_api_client: LeakbotApiClient,
+):
+    """Benchmark the peak memory of the first refresh and what it keeps."""
+    # Warm up first, so imports and the mock responses are not counted.
+    await _first_sync(hass, synthetic_api_client)
+
+    # Measure with a new client, so nothing kept by the warm up is counted.
+    client = _new_client(synthetic_api_client)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        coordinator = await _first_sync(hass, client)
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    assert coordinator.data
+    record_benchmark(account, "first_sync_peak_bytes", peak - before)
+    record_benchmark(
+        account, "retained_bytes_per_device", (current - before) / account.devices
+    )
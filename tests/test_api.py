@@ -1,14 +1,34 @@
 """Test the API Client."""
 
+import asyncio
+import json
 import pytest
 
+from unittest.mock import AsyncMock, patch
+
 from aiohttp import ClientSession
+from aiohttp.web import Application, Request, Response, json_response
 
 from custom_components.leakbot.api import (
+    API_DEVICE_LIST,
+    API_DEVICE_MYMSG,
+    API_DEVICE_MYSIMPLEMSG,
+    API_DEVICE_MYVIEW,
+    API_URL,
+    BREAKER_THRESHOLD,
+    UNCHANGED,
     LeakbotApiClient,
     LeakbotApiClientAuthenticationError,
-    LeakbotApiClientTokenError,
+    LeakbotApiClientCircuitOpenError,
+    LeakbotApiClientCommunicationError,
+    LeakbotApiClientError,
+    LeakbotCircuitBreaker,
+    LeakbotEventListParser,
+    LeakbotRateLimiter,
 )
+from custom_components.leakbot.const import DEFAULT_RATE_BURST, DEFAULT_RATE_LIMIT
+
+from .conftest import ClientSessionGenerator, load_fixture
 
 
 async def test_setup(leakbot_api_client: LeakbotApiClient):
@@ -39,9 +59,11 @@ async def test_token_error(leakbot_api_client: LeakbotApiClient):
     assert result["token"]
     assert result["tenant_id"]
 
+    # An invalid token is renewed by logging in again.
     leakbot_api_client._token = "INVALID"
-    with pytest.raises(LeakbotApiClientTokenError):
-        await leakbot_api_client.get_device_list()
+    device_list = await leakbot_api_client.get_device_list()
+    assert device_list
+    assert leakbot_api_client._token != "INVALID"
 
 
 async def test_device_list(leakbot_api_client: LeakbotApiClient):
@@ -143,3 +165,335 @@ async def test_device_waterusage(leakbot_api_client: LeakbotApiClient):
     for device in devices["IDs"]:
         device_data = await leakbot_api_client.get_device_water_usage(device["id"], 0)
         assert device_data
+
+
+async def test_error_response(aiohttp_client: ClientSessionGenerator):
+    """Test any error response raises, not only an invalid token."""
+
+    async def device_myview(request: Request) -> Response:
+        return json_response({"error": 12, "description": "Device not found"})
+
+    app = Application()
+    app.router.add_route("POST", API_DEVICE_MYVIEW, device_myview)
+    server = await aiohttp_client(app)
+    async with ClientSession(base_url=server.make_url("/")) as session:
+        api = LeakbotApiClient("test", "test", session)
+        with pytest.raises(LeakbotApiClientError) as error:
+            await api.get_device_data("123456")
+
+    assert type(error.value) is LeakbotApiClientError
+    assert error.value.status == 12
+    assert api.retries == 0
+
+
+async def test_request_headers(aiohttp_client: ClientSessionGenerator):
+    """Test every request says it sends and accepts JSON."""
+    headers = []
+
+    async def device_list(request: Request) -> Response:
+        headers.append(request.headers)
+        return json_response({"IDs": []})
+
+    async def event_list(request: Request) -> Response:
+        headers.append(request.headers)
+        return json_response({"events": []})
+
+    app = Application()
+    app.router.add_route("POST", API_DEVICE_LIST, device_list)
+    app.router.add_route("POST", API_DEVICE_MYSIMPLEMSG, event_list)
+    server = await aiohttp_client(app)
+    async with ClientSession(base_url=server.make_url("/")) as session:
+        api = LeakbotApiClient("test", "test", session)
+        await api.get_device_list()
+        async for _ in api.iter_device_simple_event_list("123456", "2016-01-01"):
+            pass
+
+    assert len(headers) == 2
+    for request_headers in headers:
+        assert request_headers["Content-Type"] == "application/json"
+        assert request_headers["Accept"] == "application/json"
+
+
+async def test_unchanged_responses(aiohttp_client: ClientSessionGenerator):
+    """Test unchanged responses are found by ETag or by digest."""
+    view_headers = []
+    body = {"battery_sm": "GoodBattery"}
+
+    async def device_myview(request: Request) -> Response:
+        view_headers.append(request.headers)
+        if request.headers.get("If-None-Match") == '"v1"':
+            return Response(status=304)
+        return json_response(body, headers={"ETag": '"v1"'})
+
+    async def device_messages(request: Request) -> Response:
+        return json_response(body)
+
+    app = Application()
+    app.router.add_route("POST", API_DEVICE_MYVIEW, device_myview)
+    app.router.add_route("POST", API_DEVICE_MYMSG, device_messages)
+    server = await aiohttp_client(app)
+    async with ClientSession(base_url=server.make_url("/")) as session:
+        api = LeakbotApiClient("test", "test", session)
+
+        # The ETag is sent back and the server answers not modified.
+        assert await api.get_device_data("123456") == body
+        assert await api.get_device_data("123456") is UNCHANGED
+        assert "If-None-Match" not in view_headers[0]
+        assert view_headers[1]["If-None-Match"] == '"v1"'
+
+        # Without validators the same body is found by its digest.
+        assert await api.get_device_messages("123456") == body
+        assert await api.get_device_messages("123456") is UNCHANGED
+        body["battery_sm"] = "LowBattery"
+        assert await api.get_device_messages("123456") == body
+
+        # Each device has its own fingerprint.
+        assert await api.get_device_messages("234567") == body
+
+    assert api.diagnostics["unchanged_responses"] == {
+        API_DEVICE_MYVIEW: {"requests": 2, "unchanged": 1, "hit_rate": 0.5},
+        API_DEVICE_MYMSG: {"requests": 4, "unchanged": 1, "hit_rate": 0.25},
+    }
+
+
+@pytest.fixture
+def no_backoff():
+    """Retry failed requests without waiting."""
+    with patch("custom_components.leakbot.api.API_BACKOFF_BASE", 0):
+        yield
+
+
+async def test_retry_server_error(leakbot_session: ClientSession, no_backoff):
+    """Test a server error is retried."""
+    api = LeakbotApiClient("test", "test", leakbot_session)
+    with patch.object(
+        api,
+        "_post_once",
+        AsyncMock(
+            side_effect=[LeakbotApiClientCommunicationError(503, "busy"), {"IDs": []}]
+        ),
+    ) as post_once:
+        assert await api.get_device_list() == {"IDs": []}
+
+    assert post_once.call_count == 2
+    assert api.retries == 1
+    assert api.diagnostics["circuit_breaker"]["state"] == "closed"
+
+
+async def test_no_retry_client_error(leakbot_session: ClientSession, no_backoff):
+    """Test a client error is not retried."""
+    api = LeakbotApiClient("test", "test", leakbot_session)
+    with (
+        patch.object(
+            api,
+            "_post_once",
+            AsyncMock(side_effect=LeakbotApiClientCommunicationError(400, "bad")),
+        ) as post_once,
+        pytest.raises(LeakbotApiClientCommunicationError),
+    ):
+        await api.get_device_list()
+
+    assert post_once.call_count == 1
+    assert api.retries == 0
+
+
+async def test_circuit_breaker_opens(leakbot_session: ClientSession, no_backoff):
+    """Test requests fail fast once the circuit opens."""
+    api = LeakbotApiClient("test", "test", leakbot_session)
+    with patch.object(
+        api,
+        "_post_once",
+        AsyncMock(side_effect=LeakbotApiClientCommunicationError(None, "timeout")),
+    ) as post_once:
+        # Each read is tried three times but counts as a single failure.
+        for _ in range(BREAKER_THRESHOLD):
+            with pytest.raises(LeakbotApiClientCommunicationError):
+                await api.get_device_list()
+        assert post_once.call_count == BREAKER_THRESHOLD * 3
+
+        # Further requests are not sent while the circuit is open.
+        with pytest.raises(LeakbotApiClientCircuitOpenError):
+            await api._post(f"{API_URL}{API_DEVICE_LIST}", {})
+        assert post_once.call_count == BREAKER_THRESHOLD * 3
+
+    assert api.diagnostics["circuit_breaker"] == {
+        "state": "open",
+        "failures": BREAKER_THRESHOLD,
+        "times_opened": 1,
+    }
+
+
+async def test_circuit_breaker_client_errors(
+    leakbot_session: ClientSession, no_backoff
+):
+    """Test client errors are not retried or counted as failures."""
+    api = LeakbotApiClient("test", "test", leakbot_session)
+    with patch.object(
+        api,
+        "_post_once",
+        AsyncMock(side_effect=LeakbotApiClientCommunicationError(404, "not found")),
+    ):
+        for _ in range(BREAKER_THRESHOLD + 1):
+            with pytest.raises(LeakbotApiClientCommunicationError):
+                await api.get_device_list()
+
+    assert api.diagnostics["circuit_breaker"]["state"] == "closed"
+    assert api.diagnostics["circuit_breaker"]["failures"] == 0
+
+
+async def test_circuit_breaker_single_probe(leakbot_session: ClientSession, no_backoff):
+    """Test only one request is let through while the circuit is half open."""
+    api = LeakbotApiClient("test", "test", leakbot_session)
+    api._breaker = LeakbotCircuitBreaker(threshold=1, reset=60)
+    with patch("custom_components.leakbot.api.time.monotonic", return_value=100):
+        api._breaker.record_failure()
+        assert api._breaker.state == "open"
+
+    release = asyncio.Event()
+
+    async def post_once(url: str, params: dict) -> dict:
+        await release.wait()
+        return {"IDs": []}
+
+    with (
+        patch("custom_components.leakbot.api.time.monotonic", return_value=160),
+        patch.object(api, "_post_once", side_effect=post_once) as mock_post_once,
+    ):
+        assert api._breaker.state == "half_open"
+        probe = asyncio.create_task(api.get_device_list())
+        await asyncio.sleep(0)
+
+        # A second request while the probe is in flight fails fast.
+        with pytest.raises(LeakbotApiClientCircuitOpenError):
+            await api.get_device_list()
+
+        release.set()
+        assert await probe == {"IDs": []}
+        assert mock_post_once.call_count == 1
+
+    assert api._breaker.state == "closed"
+
+
+def test_circuit_breaker_reset():
+    """Test the circuit half opens after the reset period and closes on success."""
+    breaker = LeakbotCircuitBreaker(threshold=2, reset=60)
+    with patch("custom_components.leakbot.api.time.monotonic", return_value=100):
+        breaker.record_failure()
+        assert breaker.state == "closed"
+        breaker.record_failure()
+        assert breaker.state == "open"
+        with pytest.raises(LeakbotApiClientCircuitOpenError):
+            breaker.check()
+
+    with patch("custom_components.leakbot.api.time.monotonic", return_value=160):
+        assert breaker.state == "half_open"
+        breaker.check()
+
+        # A failure while half open opens the circuit again.
+        breaker.record_failure()
+        breaker.release()
+        assert breaker.state == "open"
+        assert breaker.times_opened == 2
+
+    with patch("custom_components.leakbot.api.time.monotonic", return_value=220):
+        breaker.check()
+        breaker.record_success()
+        breaker.release()
+        assert breaker.state == "closed"
+
+
+async def test_rate_limiter_waits():
+    """Test requests wait once the burst is used up."""
+    limiter = LeakbotRateLimiter(rate=20, burst=2)
+    await limiter.acquire()
+    await limiter.acquire()
+    assert limiter.total_wait < 0.01
+
+    waited = await limiter.acquire()
+    assert waited >= 0.04
+    assert limiter.total_wait >= waited
+
+
+def test_rate_limiter_strictest_limit():
+    """Test the strictest limit of all entries applies."""
+    limiter = LeakbotRateLimiter()
+    limiter.set_limit("entry_1", 1.0, 10)
+    limiter.set_limit("entry_2", 5.0, 5)
+    assert (limiter._rate, limiter._burst) == (1.0, 5)
+
+    limiter.remove_limit("entry_1")
+    assert (limiter._rate, limiter._burst) == (5.0, 5)
+
+    limiter.remove_limit("entry_2")
+    assert (limiter._rate, limiter._burst) == (DEFAULT_RATE_LIMIT, DEFAULT_RATE_BURST)
+
+
+def parse_in_chunks(document: bytes, size: int) -> tuple[list, LeakbotEventListParser]:
+    """Feed a document to a new parser in chunks of a size."""
+    parser = LeakbotEventListParser()
+    events = []
+    for start in range(0, len(document), size):
+        events.extend(
+            json.loads(event) for event in parser.feed(document[start : start + size])
+        )
+    return events, parser
+
+
+def test_event_list_parser():
+    """Test events are split out wherever the chunks are cut."""
+    events = [
+        {"derived_event_id": "1", "text": 'quote " brace } bracket ]'},
+        {"derived_event_id": "2", "text": 'backslash \\ and \\" escaped'},
+        {"derived_event_id": "3", "nested": {"list": [1, {"deep": "]}"}], "x": {}}},
+        {"derived_event_id": "4", "text": "unicode \u00e9 caf\u00e9"},
+    ]
+    document = json.dumps(
+        {
+            "meta": {"events": [{"not": "an event"}]},
+            "events_total": "4",
+            "events": events,
+            "after": [{"not": "an event"}],
+        }
+    ).encode()
+
+    for size in range(1, len(document) + 1):
+        parsed, parser = parse_in_chunks(document, size)
+        assert parsed == events, f"chunk size {size}"
+        assert parser.found
+
+
+def test_event_list_parser_empty():
+    """Test an empty events array is found with no events."""
+    parsed, parser = parse_in_chunks(b'{"events": []}', 3)
+    assert parsed == []
+    assert parser.found
+
+
+def test_event_list_parser_error():
+    """Test an error body has no events and is kept to decode at the end."""
+    document = b'{"error": 52, "description": "Invalid token [events]"}'
+    for size in range(1, len(document) + 1):
+        parsed, parser = parse_in_chunks(document, size)
+        assert parsed == []
+        assert not parser.found
+        assert json.loads(parser.head) == {
+            "error": 52,
+            "description": "Invalid token [events]",
+        }
+
+
+async def test_iter_device_simple_event_list(leakbot_api_client: LeakbotApiClient):
+    """Test the streamed event list matches the response, renewing the token."""
+    await leakbot_api_client.login()
+    leakbot_api_client._token = "INVALID"
+
+    events = [
+        event
+        async for batch in leakbot_api_client.iter_device_simple_event_list(
+            "234567", "2016-01-01 00:00:00"
+        )
+        for event in batch
+    ]
+    expected = json.loads(load_fixture("device_mysimpleeventlist_234567.json"))
+    assert events == expected["events"]
+    assert leakbot_api_client._token != "INVALID"
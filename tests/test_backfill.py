@@ -0,0 +1,101 @@
+"""Test the water usage backfill."""
+
+import json
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.leakbot.api import LeakbotApiClient
+from custom_components.leakbot.backfill import WaterUsageBackfill
+from custom_components.leakbot.const import DOMAIN
+from custom_components.leakbot.coordinator import LeakbotDataUpdateCoordinator
+from custom_components.leakbot.models import LeakbotWaterUsage
+from custom_components.leakbot.sensor import (
+    LeakbotSensorEntityDescription,
+    LeakbotWaterHistorySensor,
+)
+
+from .conftest import VALID_LOGIN, load_fixture
+
+
+def water_usage_fixture() -> LeakbotWaterUsage:
+    """Return the water usage fixture for device 123456."""
+    return LeakbotWaterUsage.from_json(
+        json.loads(load_fixture("device_waterusage_123456_0.json"))
+    )
+
+
+def oldest_day(water_usage: LeakbotWaterUsage):
+    """Return the local midnight starting the oldest day of the water usage."""
+    read_date = dt_util.as_local(dt_util.utc_from_timestamp(water_usage.ts / 1000))
+    return read_date.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(
+        days=min(day.offset for day in water_usage.days)
+    )
+
+
+def test_backfill_missing_days():
+    """Test days older than the reading are counted as missing."""
+    water_usage = water_usage_fixture()
+    backfill = WaterUsageBackfill()
+
+    # Nothing is missing before the first import.
+    assert backfill.check("123456", water_usage, dt_util.utc_from_timestamp(0)) == 0
+
+    # The day before the oldest day read is allowed for a time zone shift.
+    since = oldest_day(water_usage) - timedelta(days=1)
+    assert backfill.check("123456", water_usage, since) == 0
+
+    since = oldest_day(water_usage) - timedelta(days=31)
+    assert backfill.check("123456", water_usage, since) == 30
+    assert backfill.missing_days("123456") == 30
+    assert backfill.missing_days("234567") == 0
+
+
+async def test_backfill_from_reading(
+    hass: HomeAssistant,
+    leakbot_api_client: LeakbotApiClient,
+):
+    """Test a gap is filled from the latest reading without more requests."""
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    coordinator = LeakbotDataUpdateCoordinator(hass, leakbot_api_client, entry, 15)
+
+    with patch.object(
+        leakbot_api_client,
+        "get_device_water_usage",
+        wraps=leakbot_api_client.get_device_water_usage,
+    ) as get_water_usage:
+        await coordinator.async_refresh()
+        assert sorted(call.args for call in get_water_usage.call_args_list) == [
+            ("123456", 0),
+            ("234567", 0),
+        ]
+
+        device = coordinator.data["devices"]["123456"]
+        sensor = LeakbotWaterHistorySensor(
+            coordinator,
+            device,
+            LeakbotSensorEntityDescription(
+                key="water_usage", name="water_usage_events"
+            ),
+        )
+        sensor.hass = hass
+        sensor._statistics_since = oldest_day(device["water_usage"]) - timedelta(
+            days=31
+        )
+        with patch(
+            "custom_components.leakbot.sensor.async_import_statistics"
+        ) as import_statistics:
+            await sensor.update_statistics()
+
+        assert get_water_usage.call_count == 2
+
+    # Every day of the reading is imported and the older days are missing.
+    new_stats = import_statistics.call_args.args[2]
+    assert len(new_stats) == len(device["water_usage"].days) * 4
+    assert new_stats[0]["start"] == oldest_day(device["water_usage"])
+    assert coordinator.backfill.missing_days("123456") == 30
@@ -1,15 +1,19 @@
 """Leakbot Calendar Tests."""
 
+from datetime import UTC, datetime, timedelta
 from unittest.mock import patch
 import pytest
 
 from aiohttp.web import Application
 
+from ical.event import Event
+
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
 
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.leakbot.calendar import EventIntervalIndex
 from custom_components.leakbot.const import DOMAIN
 
 from .conftest import ClientSessionGenerator, VALID_LOGIN
@@ -36,7 +40,7 @@ async def test_calendar_setup(
     entry.add_to_hass(hass)
 
     with patch(
-        "custom_components.leakbot.async_get_clientsession",
+        "custom_components.leakbot.async_get_leakbot_session",
         return_value=session,
     ):
         await hass.config_entries.async_setup(entry.entry_id)
@@ -48,3 +52,49 @@ async def test_calendar_setup(
     )
 
     assert hass.states.get("calendar.leakbot_5abcdef_events") is not None
+
+
+def test_event_interval_index():
+    """Test range queries return every overlapping event, oldest first."""
+    base = datetime(2025, 4, 1, tzinfo=UTC)
+
+    def event(uid: str, start_hours: float, end_hours: float) -> Event:
+        return Event(
+            uid=uid,
+            summary=uid,
+            start=base + timedelta(hours=start_hours),
+            end=base + timedelta(hours=end_hours),
+        )
+
+    events = [
+        event("short_late", 30, 31),
+        event("long", 0, 48),
+        event("before", 1, 2),
+        event("open", 10, 10),
+        event("touching", 3, 5),
+        event("after", 20, 21),
+    ]
+    index = EventIntervalIndex(events)
+
+    def overlapping(start_hours: float, end_hours: float) -> list[str]:
+        return [
+            calendar_event.summary
+            for calendar_event in index.overlapping(
+                base + timedelta(hours=start_hours), base + timedelta(hours=end_hours)
+            )
+        ]
+
+    # The long event still overlaps after shorter later events end.
+    assert overlapping(5, 20) == ["long", "open"]
+    assert overlapping(2, 3) == ["long"]
+    assert overlapping(10.25, 10.75) == ["long", "open"]
+    assert overlapping(25, 35) == ["long", "short_late"]
+    assert overlapping(48, 60) == []
+    assert overlapping(-5, 100) == [
+        "long",
+        "before",
+        "touching",
+        "open",
+        "after",
+        "short_late",
+    ]
@@ -6,13 +6,22 @@ from homeassistant import config_entries, data_entry_flow
 from homeassistant.core import HomeAssistant
 from homeassistant.const import (
     CONF_PASSWORD,
+    CONF_SCAN_INTERVAL,
     CONF_USERNAME,
 )
 
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from custom_components.leakbot.api import LeakbotApiClientAuthenticationError
-from custom_components.leakbot.const import DOMAIN
+from custom_components.leakbot.const import (
+    DOMAIN,
+    CONF_ADAPTIVE_POLLING,
+    CONF_HISTORY_INTERVAL,
+    CONF_MAX_REQUESTS,
+    CONF_RATE_BURST,
+    CONF_RATE_LIMIT,
+    DEFAULT_HISTORY_INTERVAL,
+)
 
 
 async def test_form_success(hass: HomeAssistant):
@@ -130,3 +139,38 @@ async def test_form_reauth(hass: HomeAssistant):
     assert "reason" in result2
     assert result2["type"] == "abort"
     assert result2["reason"] == "reauth_successful"
+
+
+async def test_options_flow(hass: HomeAssistant):
+    """Test the options form shows the current options and saves new ones."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_PASSWORD: "hash",
+            CONF_USERNAME: "user.name",
+        },
+        options={CONF_SCAN_INTERVAL: 60},
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == data_entry_flow.FlowResultType.FORM
+    assert result["step_id"] == "user"
+
+    defaults = {str(key): key.default() for key in result["data_schema"].schema}
+    assert defaults[CONF_SCAN_INTERVAL] == 60
+    assert defaults[CONF_HISTORY_INTERVAL] == DEFAULT_HISTORY_INTERVAL
+
+    options = {
+        CONF_SCAN_INTERVAL: 30,
+        CONF_HISTORY_INTERVAL: 120,
+        CONF_ADAPTIVE_POLLING: True,
+        CONF_MAX_REQUESTS: 2,
+        CONF_RATE_LIMIT: 1.0,
+        CONF_RATE_BURST: 10,
+    }
+    result = await hass.config_entries.options.async_configure(
+        result["flow_id"], user_input=options
+    )
+    assert result["type"] == data_entry_flow.FlowResultType.CREATE_ENTRY
+    assert entry.options == options
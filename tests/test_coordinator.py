@@ -1,18 +1,38 @@
 """Test the Leakbot Data Update coordinator."""
 
+import asyncio
+import json
+
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+from typing import Any
+from unittest.mock import patch
+
 from aiohttp import ClientSession
 
 from ical.calendar import Calendar
+from ical.event import Event
+from ical.store import EventStore
 
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
-from custom_components.leakbot.api import LeakbotApiClient
+from custom_components.leakbot.api import (
+    LeakbotApiClient,
+    LeakbotApiClientCommunicationError,
+)
 from custom_components.leakbot.const import DOMAIN
-from custom_components.leakbot.coordinator import LeakbotDataUpdateCoordinator
+from custom_components.leakbot.coordinator import (
+    LeakbotDataUpdateCoordinator,
+    _apply_calendar_events,
+    _calendar_from_store,
+    _calendar_to_store,
+    _event_summary,
+)
 
-from .conftest import VALID_LOGIN
+from .conftest import VALID_LOGIN, load_fixture
 
 
 async def test_coordinator_setup(
@@ -41,8 +61,11 @@ async def test_coordinator_data(
     assert "123456" in coordinator.data["devices"]
 
     device = coordinator.data["devices"]["123456"]
-    assert device["last_update"]["messageTimestamp"] == "2025-04-11 02:16:26"
-    assert device["water_usage"]["days"][0]["dayNumber"] == "6"
+    assert device["last_update"].timestamp == datetime(
+        2025, 4, 11, 2, 16, 26, tzinfo=UTC
+    )
+    assert device["water_usage"].days[0].offset == -2
+    assert device["water_usage"].days[0].morning == 3
 
     device_cal: Calendar = device["calendar"]
     assert device_cal.events[0].summary == "HighFlow"
@@ -90,3 +113,289 @@ async def test_token_error(
     await hass.async_block_till_done()
     assert coordinator.data
     assert leakbot_api_client._token != "INVALID"
+
+
+async def test_partial_device_failure(
+    hass: HomeAssistant,
+    leakbot_api_client: LeakbotApiClient,
+):
+    """Test a device with a response that cannot be parsed does not fail others."""
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    coordinator = LeakbotDataUpdateCoordinator(hass, leakbot_api_client, entry, 15)
+    get_device_messages = leakbot_api_client.get_device_messages
+
+    async def messages(device_id: str) -> dict[str, Any]:
+        if device_id == "234567":
+            return {}
+        return await get_device_messages(device_id)
+
+    with patch.object(leakbot_api_client, "get_device_messages", messages):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert "last_update" in coordinator.data["devices"]["123456"]
+    assert "last_update" not in coordinator.data["devices"]["234567"]
+
+    # The refresh only fails when every device fails.
+    with patch.object(leakbot_api_client, "get_device_messages", return_value={}):
+        await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+
+
+async def test_max_requests(
+    hass: HomeAssistant,
+    leakbot_api_client: LeakbotApiClient,
+):
+    """Test no more than max_requests requests are in flight at once."""
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    coordinator = LeakbotDataUpdateCoordinator(
+        hass, leakbot_api_client, entry, 15, max_requests=2
+    )
+    await leakbot_api_client.login()
+    post = leakbot_api_client._post
+    in_flight = 0
+    peak = 0
+
+    async def counted_post(*args: Any) -> dict[str, Any]:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(0)
+            return await post(*args)
+        finally:
+            in_flight -= 1
+
+    with patch.object(leakbot_api_client, "_post", counted_post):
+        await coordinator.async_refresh()
+
+    assert coordinator.last_update_success
+    assert peak == 2
+
+
+async def test_startup_jitter(
+    hass: HomeAssistant,
+    leakbot_api_client: LeakbotApiClient,
+):
+    """Test the jitter delays every refresh until the first update succeeds."""
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    with patch("custom_components.leakbot.coordinator.random.uniform", return_value=60):
+        coordinator = LeakbotDataUpdateCoordinator(hass, leakbot_api_client, entry, 15)
+    jittered = timedelta(minutes=15, seconds=60)
+    assert coordinator.update_interval == jittered
+
+    # A failed first update keeps the jitter for the next refresh.
+    with patch.object(
+        leakbot_api_client,
+        "get_device_list",
+        side_effect=LeakbotApiClientCommunicationError(None, "timeout"),
+    ):
+        await coordinator.async_refresh()
+    assert not coordinator.last_update_success
+    assert coordinator.update_interval == jittered
+
+    # The refresh scheduled after the first update still has the jitter.
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success
+    assert coordinator.update_interval == jittered
+
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(minutes=15)
+
+
+async def test_adaptive_polling(
+    hass: HomeAssistant,
+    leakbot_api_client: LeakbotApiClient,
+):
+    """Test adaptive polling only reads messages, and events during a leak."""
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    coordinator = LeakbotDataUpdateCoordinator(
+        hass, leakbot_api_client, entry, 15, adaptive_polling=True
+    )
+    await coordinator.async_refresh()
+    devices = coordinator.data["devices"]
+    assert coordinator._poll_interval(devices) == timedelta(minutes=60)
+
+    client = leakbot_api_client
+    with (
+        patch.object(
+            client, "get_device_messages", wraps=client.get_device_messages
+        ) as messages,
+        patch.object(client, "get_device_data", wraps=client.get_device_data) as info,
+        patch.object(
+            client,
+            "iter_device_simple_event_list",
+            wraps=client.iter_device_simple_event_list,
+        ) as event_list,
+    ):
+        # Quiet, an unchanged message is the only request per device.
+        await coordinator.async_refresh()
+        assert messages.call_count == 2
+        assert info.call_count == 0
+        assert event_list.call_count == 0
+
+        # During a leak the events are read even when the message is unchanged.
+        device = devices["123456"]
+        device["event_summary"] = replace(device["event_summary"], leak_active=True)
+        assert coordinator._poll_interval(devices) == timedelta(minutes=15)
+        await coordinator.async_refresh()
+        assert messages.call_count == 4
+        assert info.call_count == 0
+        assert [call.args[0] for call in event_list.call_args_list] == ["123456"]
+
+
+async def test_event_watermark(
+    hass: HomeAssistant,
+    leakbot_api_client: LeakbotApiClient,
+):
+    """Test events are requested from the watermark and open events."""
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    coordinator = LeakbotDataUpdateCoordinator(hass, leakbot_api_client, entry, 15)
+
+    with patch.object(
+        leakbot_api_client,
+        "iter_device_simple_event_list",
+        wraps=leakbot_api_client.iter_device_simple_event_list,
+    ) as event_list:
+        await coordinator.async_refresh()
+        assert {call.args[1] for call in event_list.call_args_list} == {
+            "2016-01-01 00:00:00"
+        }
+
+        device = coordinator.data["devices"]["123456"]
+        assert device["event_watermark"] == datetime(2025, 4, 11, 5, 21, 29, tzinfo=UTC)
+
+        # A recent open event is refetched from when it started.
+        device["open_events"]["1"] = device["event_watermark"] - timedelta(days=2)
+        # Make the history due again.
+        for device_data in coordinator.data["devices"].values():
+            device_data["last_fetch"].clear()
+        event_list.reset_mock()
+        await coordinator.async_refresh()
+
+    starting_dates = {call.args[0]: call.args[1] for call in event_list.call_args_list}
+    assert starting_dates["123456"] == "2025-04-09 05:21:29"
+
+    # The event left open since 2022 no longer holds back the start date.
+    assert starting_dates["234567"] == "2025-04-11 05:21:29"
+
+
+async def test_is_fresh(
+    hass: HomeAssistant,
+    leakbot_api_client: LeakbotApiClient,
+):
+    """Test data is fresh for three of its refresh intervals."""
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    coordinator = LeakbotDataUpdateCoordinator(
+        hass, leakbot_api_client, entry, 15, history_interval=10
+    )
+    await coordinator.async_refresh()
+    assert coordinator.is_fresh("123456", "info")
+    assert coordinator.is_fresh("123456", "events")
+
+    last_fetch = coordinator.data["devices"]["123456"]["last_fetch"]
+    now = dt_util.utcnow()
+    last_fetch["info"] = now - timedelta(minutes=50)
+    assert not coordinator.is_fresh("123456", "info")
+
+    # History shorter than the scan interval is still only read each scan.
+    last_fetch["events"] = now - timedelta(minutes=40)
+    assert coordinator.is_fresh("123456", "events")
+    last_fetch["events"] = now - timedelta(minutes=50)
+    assert not coordinator.is_fresh("123456", "events")
+
+
+async def test_calendar_store_round_trip(
+    hass: HomeAssistant,
+    hass_storage: dict[str, Any],
+    leakbot_api_client: LeakbotApiClient,
+):
+    """Test the calendars are saved and restored without duplicating events."""
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    coordinator = LeakbotDataUpdateCoordinator(hass, leakbot_api_client, entry, 15)
+    await coordinator.async_refresh()
+    await coordinator.async_save_calendars()
+
+    saved = hass_storage[f"{DOMAIN}.{entry.entry_id}.calendar"]["data"]
+    saved_events = saved["123456"]
+    assert saved_events == _calendar_to_store(
+        coordinator.data["devices"]["123456"]["calendar"]
+    )
+
+    # A new coordinator restores the calendar before the first refresh.
+    restored = LeakbotDataUpdateCoordinator(hass, leakbot_api_client, entry, 15)
+    await restored.async_load_calendars()
+    assert _calendar_to_store(restored._stored_calendars["123456"]) == saved_events
+    await restored.async_refresh()
+
+    device_cal: Calendar = restored.data["devices"]["123456"]["calendar"]
+    assert _calendar_to_store(device_cal) == saved_events
+
+
+def test_calendar_from_store():
+    """Test a stored calendar is rebuilt with the same events."""
+    stored = [
+        {
+            "uid": "4142204",
+            "start": "2025-04-11T02:18:05+00:00",
+            "end": "2025-04-11T05:21:29+00:00",
+            "summary": "HighFlow",
+            "description": "null",
+        }
+    ]
+    device_cal = _calendar_from_store(stored)
+
+    assert device_cal.events[0].start == datetime(2025, 4, 11, 2, 18, 5, tzinfo=UTC)
+    assert _calendar_to_store(device_cal) == stored
+
+
+def test_event_summary():
+    """Test the summary finds the oldest event and open leaks."""
+    base = datetime(2025, 4, 1, tzinfo=UTC)
+    events = [
+        # First fetch, newest first, then a later fetch appends a newer event.
+        Event(uid="2", summary="HighFlow", start=base + timedelta(days=2)),
+        Event(uid="1", summary="HighFlow", start=base),
+        Event(uid="3", summary="LeakTrue", start=base + timedelta(days=5)),
+    ]
+    calendar_index = {event.uid: event for event in events}
+
+    summary = _event_summary(calendar_index, {"3": events[2].start})
+    assert summary.count == 3
+    assert summary.first_event == base
+    assert summary.leak_active
+
+    summary = _event_summary({}, {})
+    assert summary.first_event is None
+    assert not summary.leak_active
+
+
+def test_apply_calendar_events_replay():
+    """Test applying the same events again writes nothing to the calendar."""
+    events = json.loads(load_fixture("device_mysimpleeventlist_sample.json"))["events"]
+    device_calendar = Calendar()
+    calendar_index: dict[str, Event] = {}
+    open_events: dict[str, datetime] = {}
+
+    summary = _apply_calendar_events(
+        device_calendar, calendar_index, open_events, events
+    )
+    assert summary["added"] == len(events)
+    assert len(device_calendar.events) == len(events)
+
+    with (
+        patch.object(EventStore, "add") as add,
+        patch.object(EventStore, "edit") as edit,
+    ):
+        replay = _apply_calendar_events(
+            device_calendar, calendar_index, open_events, events
+        )
+
+    add.assert_not_called()
+    edit.assert_not_called()
+    assert replay == {
+        "added": 0,
+        "updated": 0,
+        "unchanged": len(events),
+        "watermark": summary["watermark"],
+    }
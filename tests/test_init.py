@@ -2,6 +2,10 @@
 
 import pytest
 
+from datetime import timedelta
+from functools import partial
+
+from aiohttp import ClientSession
 from aiohttp.web import Application
 
 from unittest.mock import patch
@@ -9,14 +13,22 @@ from unittest.mock import patch
 from homeassistant.core import HomeAssistant
 from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import Platform
+from homeassistant.util import dt as dt_util
 
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
 from custom_components.leakbot import (
     async_reload_entry,
     LeakbotDataUpdateCoordinator,
 )
-from custom_components.leakbot.const import DOMAIN
+from custom_components.leakbot.const import (
+    DATA_SESSIONS,
+    DOMAIN,
+    SERVICE_REFRESH_ACCOUNT,
+)
 
 from .conftest import ClientSessionGenerator, VALID_LOGIN
 
@@ -43,7 +55,7 @@ async def test_setup_unload_and_reload_entry(
     entry.add_to_hass(hass)
 
     with patch(
-        "custom_components.leakbot.async_get_clientsession",
+        "custom_components.leakbot.async_get_leakbot_session",
         return_value=session,
     ) as mock_session:
         await hass.config_entries.async_setup(entry.entry_id)
@@ -81,7 +93,7 @@ async def test_unload_entry(
 
     # Check the Config is initiated
     with patch(
-        "custom_components.leakbot.async_get_clientsession",
+        "custom_components.leakbot.async_get_leakbot_session",
         return_value=session,
     ):
         assert await hass.config_entries.async_setup(entry.entry_id) is True, (
@@ -94,3 +106,74 @@ async def test_unload_entry(
             "Component Config Unload Failed."
         )
         assert entry.state == ConfigEntryState.NOT_LOADED
+
+
+async def test_refresh_account_service(
+    hass: HomeAssistant,
+    leakbot_api: Application,
+    aiohttp_client: ClientSessionGenerator,
+):
+    """Test the service reads the account details again."""
+    session = await aiohttp_client(leakbot_api)
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    entry.add_to_hass(hass)
+
+    with patch(
+        "custom_components.leakbot.async_get_leakbot_session",
+        return_value=session,
+    ):
+        assert await hass.config_entries.async_setup(entry.entry_id)
+        await hass.async_block_till_done()
+
+        coordinator: LeakbotDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+        with patch.object(
+            coordinator.client,
+            "get_account_myread",
+            wraps=coordinator.client.get_account_myread,
+        ) as account_myread:
+            await hass.services.async_call(
+                DOMAIN, SERVICE_REFRESH_ACCOUNT, blocking=True
+            )
+
+            # Let the refresh debounce finish.
+            async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=11))
+            await hass.async_block_till_done()
+
+        assert account_myread.call_count == 1
+        assert coordinator.data["account"]
+
+        # The service is removed with the last entry.
+        assert await hass.config_entries.async_unload(entry.entry_id)
+        assert not hass.services.has_service(DOMAIN, SERVICE_REFRESH_ACCOUNT)
+
+
+async def test_shared_session(
+    hass: HomeAssistant,
+    leakbot_api: Application,
+    aiohttp_client: ClientSessionGenerator,
+):
+    """Test entries share one session, closed when the last entry unloads."""
+    server = await aiohttp_client(leakbot_api)
+    entries = [MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN) for _ in range(2)]
+
+    with patch(
+        "custom_components.leakbot.session.ClientSession",
+        partial(ClientSession, base_url=server.make_url("/")),
+    ):
+        for entry in entries:
+            entry.add_to_hass(hass)
+            assert await hass.config_entries.async_setup(entry.entry_id)
+            await hass.async_block_till_done()
+
+    sessions = {
+        id(hass.data[DOMAIN][entry.entry_id].client._session) for entry in entries
+    }
+    assert len(sessions) == 1
+    session: ClientSession = hass.data[DOMAIN][entries[0].entry_id].client._session
+
+    assert await hass.config_entries.async_unload(entries[0].entry_id)
+    assert not session.closed
+
+    assert await hass.config_entries.async_unload(entries[1].entry_id)
+    assert session.closed
+    assert DATA_SESSIONS not in hass.data
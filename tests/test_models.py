@@ -0,0 +1,74 @@
+"""Test the Leakbot device data models."""
+
+import json
+
+from datetime import UTC, datetime
+
+from custom_components.leakbot.models import (
+    LeakbotDeviceInfo,
+    LeakbotMessage,
+    LeakbotWaterUsage,
+)
+
+from .conftest import load_fixture
+
+
+def test_device_info():
+    """Test parsing the device view."""
+    info = LeakbotDeviceInfo.from_json(
+        json.loads(load_fixture("device_myview_123456.json"))
+    )
+    assert info.leak_free_days == 722
+
+
+def test_device_info_missing_summary():
+    """Test parsing a device view without a leak count summary."""
+    info = LeakbotDeviceInfo.from_json({"battery_sm": "Good"})
+    assert info.battery_sm == "Good"
+    assert info.leak_free_days is None
+
+
+def test_device_info_partial_summary():
+    """Test parsing a leak count summary without leak free days."""
+    for leak_count_summary in (
+        None,
+        {"leak_count": "0"},
+        {"leak_free_days": None},
+        {"leak_free_days": "null"},
+    ):
+        info = LeakbotDeviceInfo.from_json(
+            {"battery_sm": "Good", "leak_count_summary": leak_count_summary}
+        )
+        assert info.leak_free_days is None
+
+
+def test_message():
+    """Test parsing the newest message."""
+    message = LeakbotMessage.from_json(
+        json.loads(load_fixture("device_mylistmsg4device_123456.json"))
+    )
+    assert message is not None
+    assert message.timestamp == datetime(2025, 4, 11, 2, 16, 26, tzinfo=UTC)
+
+
+def test_message_empty():
+    """Test parsing an empty message list."""
+    assert LeakbotMessage.from_json({"list": {}}) is None
+
+
+def test_water_usage():
+    """Test parsing water usage keeps the buckets as numbers."""
+    water_usage = LeakbotWaterUsage.from_json(
+        json.loads(load_fixture("device_waterusage_123456_0.json"))
+    )
+    assert water_usage.ts == 1742821037096
+
+    day = water_usage.days[0]
+    assert day.offset == -2
+    assert (day.night, day.morning, day.afternoon, day.evening) == (1, 3, 5, 4)
+    assert (
+        LeakbotWaterUsage.from_json(
+            json.loads(load_fixture("device_waterusage_123456_0.json"))
+        )
+        == water_usage
+    )
@@ -1,17 +1,30 @@
 """Leakbot Sensor Tests."""
 
-from datetime import datetime
-from unittest.mock import patch
+import asyncio
+
+from dataclasses import replace
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock, patch
 import pytest
 
 from aiohttp.web import Application
 
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
 
 from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from custom_components.leakbot.api import LeakbotApiClient
 from custom_components.leakbot.const import DOMAIN
+from custom_components.leakbot.coordinator import LeakbotDataUpdateCoordinator
+from custom_components.leakbot.diagnostics import async_get_config_entry_diagnostics
+from custom_components.leakbot.sensor import (
+    ENTITY_DESCRIPTIONS,
+    LeakbotSensor,
+    LeakbotSensorEntityDescription,
+    LeakbotWaterHistorySensor,
+)
 
 from .conftest import ClientSessionGenerator, VALID_LOGIN
 
@@ -37,7 +50,7 @@ async def test_sensor_setup(
     entry.add_to_hass(hass)
 
     with patch(
-        "custom_components.leakbot.async_get_clientsession",
+        "custom_components.leakbot.async_get_leakbot_session",
         return_value=session,
     ):
         await hass.config_entries.async_setup(entry.entry_id)
@@ -68,7 +81,7 @@ async def test_leak_free_days_found(
     entry.add_to_hass(hass)
 
     with patch(
-        "custom_components.leakbot.async_get_clientsession",
+        "custom_components.leakbot.async_get_leakbot_session",
         return_value=session,
     ):
         await hass.config_entries.async_setup(entry.entry_id)
@@ -97,7 +110,7 @@ async def test_leak_free_days_missing(
     entry.add_to_hass(hass)
 
     with patch(
-        "custom_components.leakbot.async_get_clientsession",
+        "custom_components.leakbot.async_get_leakbot_session",
         return_value=session,
     ):
         await hass.config_entries.async_setup(entry.entry_id)
@@ -117,3 +130,150 @@ async def test_leak_free_days_missing(
         - datetime.strptime("2022-02-16 16:39:23", "%Y-%m-%d %H:%M:%S").date()
     ).days - 1
     assert state.state == str(no_days)
+
+
+async def test_sensor_suppressed_writes(
+    hass: HomeAssistant,
+    leakbot_api_client: LeakbotApiClient,
+):
+    """Test the state is only written when the value or availability changes."""
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    coordinator = LeakbotDataUpdateCoordinator(hass, leakbot_api_client, entry, 15)
+    await coordinator.async_refresh()
+
+    device = coordinator.data["devices"]["123456"]
+    description = next(
+        description
+        for description in ENTITY_DESCRIPTIONS
+        if description.key == "battery_sm"
+    )
+    sensor = LeakbotSensor(coordinator, device, description)
+    sensor.hass = hass
+    sensor._last_snapshot = sensor._state_snapshot()
+
+    with patch.object(sensor, "async_write_ha_state") as write_state:
+        # A steady state refresh writes nothing.
+        await coordinator.async_refresh()
+        assert not device["changed"]
+        sensor._handle_coordinator_update()
+        write_state.assert_not_called()
+        assert coordinator.suppressed_writes == 1
+
+        # A new value is written.
+        device["info"] = replace(device["info"], battery_sm="LowBattery")
+        device["changed"] = True
+        sensor._handle_coordinator_update()
+        assert write_state.call_count == 1
+        assert sensor.native_value == "lowbattery"
+
+        # Data going stale makes the sensor unavailable, which is written.
+        device["changed"] = False
+        device["last_fetch"]["info"] = dt_util.utcnow() - timedelta(days=1)
+        sensor._handle_coordinator_update()
+        assert write_state.call_count == 2
+        assert not sensor.available
+        assert coordinator.suppressed_writes == 1
+
+
+async def test_water_history_statistics(
+    hass: HomeAssistant,
+    leakbot_api_client: LeakbotApiClient,
+):
+    """Test the last statistics are loaded once and a repeated reading is skipped."""
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    coordinator = LeakbotDataUpdateCoordinator(hass, leakbot_api_client, entry, 15)
+    await coordinator.async_refresh()
+
+    device = coordinator.data["devices"]["123456"]
+    sensor = LeakbotWaterHistorySensor(
+        coordinator,
+        device,
+        LeakbotSensorEntityDescription(key="water_usage", name="water_usage_events"),
+    )
+    sensor.hass = hass
+
+    # The last statistic ended during the day before the newest day read.
+    read_date = dt_util.as_local(
+        dt_util.utc_from_timestamp(device["water_usage"].ts / 1000)
+    ).replace(hour=0, minute=0, second=0, microsecond=0)
+    newest_day = read_date - timedelta(days=2)
+    last_end = newest_day - timedelta(hours=1)
+    last_stats = {sensor.entity_id: [{"sum": 12.5, "end": last_end.timestamp()}]}
+    with (
+        patch(
+            "custom_components.leakbot.sensor.get_instance",
+            return_value=MagicMock(async_add_executor_job=hass.async_add_executor_job),
+        ),
+        patch(
+            "custom_components.leakbot.sensor.get_last_statistics",
+            return_value=last_stats,
+        ) as get_last_statistics,
+    ):
+        await sensor.load_last_statistics()
+    get_last_statistics.assert_called_once()
+    assert sensor._statistics_sum == 12.5
+    assert sensor._statistics_since == last_end
+
+    with patch(
+        "custom_components.leakbot.sensor.async_import_statistics"
+    ) as import_statistics:
+        await sensor.update_statistics()
+        assert import_statistics.call_count == 1
+        new_stats = import_statistics.call_args.args[2]
+        assert [stat["start"] for stat in new_stats] == [
+            newest_day + timedelta(hours=hour) for hour in (0, 6, 12, 18)
+        ]
+        assert new_stats[0]["sum"] == 12.5 + new_stats[0]["state"]
+
+        # The same reading again is not imported a second time.
+        await sensor.update_statistics()
+        assert import_statistics.call_count == 1
+
+
+async def test_water_history_statistics_queue(
+    hass: HomeAssistant,
+    leakbot_api_client: LeakbotApiClient,
+):
+    """Test updates during an import are merged into a single queued import."""
+    entry = MockConfigEntry(domain=DOMAIN, data=VALID_LOGIN)
+    coordinator = LeakbotDataUpdateCoordinator(hass, leakbot_api_client, entry, 15)
+    await coordinator.async_refresh()
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    device = coordinator.data["devices"]["123456"]
+    sensor = LeakbotWaterHistorySensor(
+        coordinator,
+        device,
+        LeakbotSensorEntityDescription(key="water_usage", name="water_usage_events"),
+    )
+    sensor.hass = hass
+    coordinator.history_sensors["123456"] = sensor
+
+    release = asyncio.Event()
+
+    async def update_statistics() -> None:
+        await release.wait()
+
+    with patch.object(
+        sensor, "update_statistics", side_effect=update_statistics
+    ) as mock_update:
+        sensor._handle_coordinator_update()
+        await asyncio.sleep(0)
+        assert sensor.statistics_queue_depth == 1
+
+        # Updates while the import runs queue one more import between them.
+        for _ in range(5):
+            sensor._handle_coordinator_update()
+        await asyncio.sleep(0)
+        assert sensor.statistics_queue_depth == 2
+
+        diagnostics = await async_get_config_entry_diagnostics(hass, entry)
+        assert diagnostics["devices"]["123456"]["statistics_queue_depth"] == 2
+        assert diagnostics["devices"]["123456"]["statistics_last_duration"] is None
+
+        release.set()
+        await hass.async_block_till_done()
+
+    assert mock_update.call_count == 2
+    assert sensor.statistics_queue_depth == 0
+    assert sensor.statistics_last_duration is not None
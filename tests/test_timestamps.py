@@ -0,0 +1,49 @@
+"""Test the Leakbot timestamp decoding."""
+
+from datetime import UTC, datetime, timedelta, timezone
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.leakbot.timestamps import (
+    NULL_TIMESTAMP,
+    parse_local_timestamp,
+    parse_timestamp,
+)
+
+
+def test_parse_timestamp():
+    """Test a timestamp is read as UTC."""
+    assert parse_timestamp("2022-03-19 13:10:18") == datetime(
+        2022, 3, 19, 13, 10, 18, tzinfo=UTC
+    )
+
+
+def test_parse_timestamp_null():
+    """Test the null sentinel and a missing value are None."""
+    assert NULL_TIMESTAMP == "null"
+    assert parse_timestamp(NULL_TIMESTAMP) is None
+    assert parse_timestamp(None) is None
+    assert parse_local_timestamp(NULL_TIMESTAMP) is None
+    assert parse_local_timestamp(None) is None
+
+
+def test_parse_timestamp_malformed():
+    """Test a malformed timestamp raises."""
+    with pytest.raises(ValueError):
+        parse_timestamp("19/03/2022 13:10")
+    with pytest.raises(ValueError):
+        parse_local_timestamp("not a timestamp")
+
+
+def test_parse_local_timestamp():
+    """Test a timestamp is converted to the given or default time zone."""
+    local_tz = timezone(timedelta(hours=10))
+    parsed = parse_local_timestamp("2022-03-19 13:10:18", local_tz)
+    assert parsed == datetime(2022, 3, 19, 23, 10, 18, tzinfo=local_tz)
+    assert parsed.utcoffset() == timedelta(hours=10)
+
+    parsed = parse_local_timestamp("2022-03-19 13:10:18")
+    assert parsed == datetime(2022, 3, 19, 13, 10, 18, tzinfo=UTC)
+    assert parsed.tzinfo == dt_util.get_default_time_zone()
@@ -0,0 +1,74 @@
+"""Test the water usage to statistics conversion."""
+
+import json
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.leakbot.models import LeakbotWaterUsage
+from custom_components.leakbot.water_usage import water_usage_to_columns
+
+from .conftest import load_fixture
+
+QUERY_DATE = datetime(2025, 3, 24, tzinfo=UTC)
+
+
+def water_usage_fixture() -> LeakbotWaterUsage:
+    """Return the water usage fixture for device 123456."""
+    return LeakbotWaterUsage.from_json(
+        json.loads(load_fixture("device_waterusage_123456_0.json"))
+    )
+
+
+def test_water_usage_columns():
+    """Test every day is converted, oldest first."""
+    water_usage = water_usage_fixture()
+    columns = water_usage_to_columns(
+        water_usage, QUERY_DATE, datetime.fromtimestamp(0, UTC), 0
+    )
+
+    assert len(columns.start) == len(columns.state) == len(columns.sum) == 28 * 4
+
+    # Oldest day, offset -29: night 1, morning 5, afternoon 8, evening 4.
+    assert columns.start[:4] == [
+        QUERY_DATE - timedelta(days=29),
+        QUERY_DATE - timedelta(days=29) + timedelta(hours=6),
+        QUERY_DATE - timedelta(days=29) + timedelta(hours=12),
+        QUERY_DATE - timedelta(days=29) + timedelta(hours=18),
+    ]
+    assert columns.state[:4] == [0.5, 2.5, 4.0, 2.0]
+    assert columns.sum[:4] == [0.5, 3.0, 7.0, 9.0]
+
+    # Newest day, offset -2: night 1, morning 3, afternoon 5, evening 4.
+    assert columns.start[-1] == QUERY_DATE - timedelta(days=2) + timedelta(hours=18)
+    assert columns.state[-4:] == [0.5, 1.5, 2.5, 2.0]
+
+    total = sum(
+        day.night + day.morning + day.afternoon + day.evening
+        for day in water_usage.days
+    )
+    assert columns.sum[-1] == total / 2
+
+
+def test_water_usage_columns_since():
+    """Test only days after since are converted and the sum carries on."""
+    columns = water_usage_to_columns(
+        water_usage_fixture(), QUERY_DATE, QUERY_DATE - timedelta(days=3), 100
+    )
+
+    assert columns.start == [
+        QUERY_DATE - timedelta(days=2) + timedelta(hours=hour)
+        for hour in (0, 6, 12, 18)
+    ]
+    assert columns.state == [0.5, 1.5, 2.5, 2.0]
+    assert columns.sum == [100.5, 102.0, 104.5, 106.5]
+
+
+def test_water_usage_columns_up_to_date():
+    """Test nothing is converted when the statistics are up to date."""
+    columns = water_usage_to_columns(
+        water_usage_fixture(), QUERY_DATE, QUERY_DATE - timedelta(days=2), 100
+    )
+
+    assert not columns.start
+    assert not columns.state
+    assert not columns.sum